@@ -2,20 +2,24 @@
 common_types.py
 集中定義所有專案共用的型別、Enum、工具函式與型別別名，供各模組 import 使用。
 """
-from enum import Enum
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+import zoneinfo
+from enum import StrEnum
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Dict, Optional, Any, Tuple
+from datetime import datetime, timezone, timedelta
+
+from settings.config import get_runtime_settings
 
 # Common Enum
-class StepStatus(str, Enum):
+class StepStatus(StrEnum):
     PENDING = "pending"
     EXECUTING = "executing"
     SUCCESS = "success"
     FAIL = "fail"
     SKIPPED = "skipped"
 
-class TaskStatus(str, Enum):
+class TaskStatus(StrEnum):
     QUEUED = "queued"
     IN_PROGRESS = "in_progress"
     DONE = "done"
@@ -50,37 +54,57 @@ class Task(BaseModel):
 class Robot(BaseModel):
     robot_id: str
 
+# Serializes a page of tasks straight to JSON bytes in pydantic-core
+TASK_LIST_ADAPTER = TypeAdapter(List[Task])
+
 def validate_task_conditional_logic(task: "Task") -> List[str]:
     """
     Validate task conditional logic and return list of validation errors
     """
+    # Only step ids and skip targets matter; scheduled patrols repeat the
+    # same shape, so results are memoized on that skeleton.
+    skip_graph = tuple((step.step_id, tuple(step.skip_on_failure or ())) for step in task.steps)
+    return list(_validate_skip_graph(skip_graph))
+
+@lru_cache(maxsize=1024)
+def _validate_skip_graph(skip_graph: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Tuple[str, ...]:
     errors = []
-    step_ids = {step.step_id for step in task.steps}
-    
-    for step in task.steps:
-        if step.skip_on_failure:
-            # Check if all skip targets exist
-            for skip_target in step.skip_on_failure:
-                if skip_target not in step_ids:
-                    errors.append(f"Step '{step.step_id}' references non-existent skip target '{skip_target}'")
-                
-                # Check for self-reference
-                if skip_target == step.step_id:
-                    errors.append(f"Step '{step.step_id}' cannot skip itself")
-    
-    return errors
+    add_error = errors.append
+    step_ids = {step_id for step_id, _ in skip_graph}
+
+    for step_id, skip_targets in skip_graph:
+        # Valid steps (all targets exist, none is the step itself) pass on set ops alone
+        if not skip_targets or (step_id not in skip_targets and step_ids.issuperset(skip_targets)):
+            continue
+        # Check if all skip targets exist
+        for skip_target in skip_targets:
+            if skip_target not in step_ids:
+                add_error(f"Step '{step_id}' references non-existent skip target '{skip_target}'")
+
+            # Check for self-reference
+            if skip_target == step_id:
+                add_error(f"Step '{step_id}' cannot skip itself")
+
+    return tuple(errors)
+
+_FALLBACK_TZ = timezone(timedelta(hours=8))  # UTC+8
+_tz_cache: Tuple[Optional[str], Any] = (None, _FALLBACK_TZ)  # (tz name, tzinfo)
 
 def get_now():
     """Get current time in the configured timezone."""
-    from datetime import datetime, timezone, timedelta
+    global _tz_cache
     try:
-        from settings.config import get_runtime_settings
-        import zoneinfo
         tz_name = get_runtime_settings().get("timezone", "Asia/Taipei")
-        tz = zoneinfo.ZoneInfo(tz_name)
     except Exception:
-        tz = timezone(timedelta(hours=8))  # fallback to UTC+8
-    return datetime.now(tz)
+        return datetime.now(_FALLBACK_TZ)
+    # Only resolve the zone again when the configured name changes
+    if tz_name != _tz_cache[0]:
+        try:
+            tz = zoneinfo.ZoneInfo(tz_name)
+        except Exception:
+            tz = _FALLBACK_TZ
+        _tz_cache = (tz_name, tz)
+    return datetime.now(_tz_cache[1])
 
 def generate_task_id() -> str:
     return get_now().strftime("%Y%m%d%H%M%S")
@@ -1,16 +1,30 @@
+import threading
+
 from services.fleet_api import FleetAPI
 from services.bio_sensor_mqtt import BioSensorMQTTClient
 
-# Global fleet instance
+# Singletons are built lazily under a lock: sync callers may run on
+# threadpool workers, and two concurrent first calls must not both construct
+_fleet_lock = threading.Lock()
+_bio_sensor_lock = threading.Lock()
+
+# Global fleet instance, created on first use
 fleet_instance: FleetAPI = None
 
 def get_fleet() -> FleetAPI:
     """Dependency function to get the fleet instance"""
     global fleet_instance
     if fleet_instance is None:
-        fleet_instance = FleetAPI()
+        with _fleet_lock:
+            if fleet_instance is None:
+                fleet_instance = FleetAPI()
     return fleet_instance
 
+async def fleet_dependency() -> FleetAPI:
+    """``Depends`` target for routes: async, so FastAPI calls it inline
+    instead of dispatching sync get_fleet() to its threadpool per request."""
+    return get_fleet()
+
 # Global bio-sensor client
 bio_sensor_client: BioSensorMQTTClient = None
 
@@ -18,13 +32,16 @@ def get_bio_sensor_client() -> BioSensorMQTTClient:
     """Get the global MQTT client instance. Returns None if mqtt_enabled is false."""
     global bio_sensor_client
     if bio_sensor_client is None:
-        from settings.config import get_runtime_settings
-        cfg = get_runtime_settings()
-        if not cfg.get("mqtt_enabled"):
-            return None
-        bio_sensor_client = BioSensorMQTTClient(
-            broker=cfg.get("mqtt_broker", "localhost"),
-            port=cfg.get("mqtt_port", 1883),
-            topic=cfg.get("mqtt_topic", "/data-test/demo/wisleep-eck/org/201906078")
-        )
+        with _bio_sensor_lock:
+            if bio_sensor_client is None:
+                from settings.config import get_runtime_settings
+                cfg = get_runtime_settings()
+                if not cfg.get("mqtt_enabled"):
+                    return None
+                bio_sensor_client = BioSensorMQTTClient(
+                    broker=cfg.get("mqtt_broker", "localhost"),
+                    port=cfg.get("mqtt_port", 1883),
+                    topic=cfg.get("mqtt_topic", "/data-test/demo/wisleep-eck/org/201906078"),
+                    qos=int(cfg.get("mqtt_qos", 0)),
+                )
     return bio_sensor_client
@@ -4,26 +4,50 @@ import routers.tasks as tasks
 import routers.settings as settings_router
 import routers.bio_sensor as bio_sensor
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
 from contextlib import asynccontextmanager
 import asyncio
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
 import os
 import sys
 import traceback
 
 from services.task_runtime import (
-    engines, task_queues, task_worker, TaskEngine
+    engines, task_queues, task_worker, TaskEngine, TASK_QUEUE_MAXSIZE
 )
+from services.fleet_api import RobotNotFoundError
 from services.scheduler import scheduler_service
+from services.telegram_service import close_telegram_client
 from dependencies import get_fleet, get_bio_sensor_client
+from utils.fast_json import ORJSONResponse
 
 # ---------------------------------------------------------------------------
 # Logging setup: stdout + per-module log files under <project_root>/data/logs/
+#
+# Handlers run on a QueueListener thread; loggers only enqueue records, so
+# request handlers on the event loop never block on stdout or disk writes.
 # ---------------------------------------------------------------------------
 _LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+_log_listener: QueueListener = None
+_log_queue_handler: QueueHandler = None
+
+class _LoggerNameFilter(logging.Filter):
+    """Pass records from any of the given loggers (or their children)."""
+
+    def __init__(self, names):
+        super().__init__()
+        self._names = tuple(names)
+        self._prefixes = tuple(n + "." for n in names)
+
+    def filter(self, record):
+        return record.name in self._names or record.name.startswith(self._prefixes)
+
 def _setup_logging():
+    global _log_listener, _log_queue_handler
     log_dir = os.path.join(get_project_root(), "data", "logs")
     os.makedirs(log_dir, exist_ok=True)
 
@@ -33,17 +57,14 @@ def _setup_logging():
     stdout_h = logging.StreamHandler(sys.stdout)
     stdout_h.setFormatter(formatter)
 
-    root = logging.getLogger()
-    root.setLevel(logging.INFO)
-    root.addHandler(stdout_h)
-
-    def _file_handler(filename):
+    def _file_handler(filename, names):
         h = RotatingFileHandler(
             os.path.join(log_dir, filename),
             maxBytes=5 * 1024 * 1024,   # 5 MB
             backupCount=3,
         )
         h.setFormatter(formatter)
+        h.addFilter(_LoggerNameFilter(names))
         return h
 
     # Route loggers → separate files
@@ -66,14 +87,36 @@ def _setup_logging():
             "services.scheduler",
         ],
     }
-    for filename, names in routing.items():
-        fh = _file_handler(filename)
-        for name in names:
-            logging.getLogger(name).addHandler(fh)
+    handlers = [stdout_h] + [_file_handler(f, names) for f, names in routing.items()]
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    _log_queue_handler = QueueHandler(log_queue)
+    root.addHandler(_log_queue_handler)
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+def _stop_log_listener():
+    """Flush the log queue and hand its handlers back to the root logger.
+
+    Records logged after this (uvicorn, scheduler and paho teardown) are
+    written synchronously instead of landing in a queue nobody drains.
+    """
+    root = logging.getLogger()
+    root.removeHandler(_log_queue_handler)
+    _log_listener.stop()  # flushes queued records
+    for h in _log_listener.handlers:
+        root.addHandler(h)
+
+# From src/backend/main.py → up 3 levels to project root
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def get_project_root():
-    """Get project root directory. From src/backend/main.py → up 3 levels to project root."""
-    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    """Get project root directory."""
+    return _PROJECT_ROOT
 
 def get_resource_path(relative_path):
     """Get absolute path to resource relative to project root."""
@@ -94,6 +137,7 @@ async def lifespan(app: FastAPI):
         if cfg.get("mqtt_enabled"):
             try:
                 bio_sensor_client = get_bio_sensor_client()
+                bio_sensor_client.start_writer()
                 bio_sensor_client.start()
                 logger.info("Bio-sensor MQTT client started successfully")
             except Exception as e:
@@ -111,7 +155,7 @@ async def lifespan(app: FastAPI):
             if not result.get("ok"):
                 raise Exception(f"Registration failed: {result.get('error', 'unknown')}")
             engines[robot_id] = TaskEngine(fleet_client, robot_id)
-            task_queues[robot_id] = asyncio.Queue()
+            task_queues[robot_id] = asyncio.Queue(maxsize=TASK_QUEUE_MAXSIZE)
             asyncio.create_task(task_worker(robot_id))
             logger.info(f"Robot '{robot_id}' registered at {robot_ip}")
         except Exception as e:
@@ -127,24 +171,89 @@ async def lifespan(app: FastAPI):
         # Cleanup
         if bio_sensor_client:
             bio_sensor_client.stop()
+            await bio_sensor_client.stop_writer()
         await scheduler_service.stop()
-        try:
-            await fleet_client.unregister_robot(robot_id)
-        except Exception:
-            pass
+        await fleet_client.shutdown()
+        await close_telegram_client()
+        settings_router.close_test_mqtt_links()
         logger.info("Application shutdown: Clean up completed.")
+        _stop_log_listener()
     except Exception as e:
         logger.error(f"Error during application startup: {e}")
         logger.error(traceback.format_exc())
         raise
 
+# Media types whose bodies are already compressed; gzip only costs CPU
+_PRECOMPRESSED_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+_PRECOMPRESSED_TYPES = {"application/zip", "application/gzip", "application/x-gzip"}
+
+
+def _is_precompressed(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "image/svg+xml":
+        return False
+    return media_type in _PRECOMPRESSED_TYPES or media_type.startswith(_PRECOMPRESSED_PREFIXES)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    """GZipResponder that skips precompressed bodies and weakens ETags.
+
+    A gzip-encoded body is not byte-identical to the plain one, so a strong
+    ETag it carries becomes weak (W/).
+    """
+
+    async def __call__(self, scope, receive, send):
+        async def send_weak_etag(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/") and headers.get("content-encoding") == "gzip":
+                    headers["etag"] = f"W/{etag}"
+            await send(message)
+
+        await super().__call__(scope, receive, send_weak_etag)
+
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            if _is_precompressed(Headers(raw=message["headers"]).get("content-type", "")):
+                # Takes GZipResponder's pass-through path for the body
+                self.content_encoding_set = True
+
+
+class _GZipExceptSSE(GZipMiddleware):
+    """GZip responses, but pass event streams and precompressed media through untouched.
+
+    GZipResponder buffers streamed chunks inside the gzip file, which would
+    hold back SSE events until enough bytes pile up.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if "text/event-stream" in headers.get("accept", "") or "gzip" not in headers.get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+        responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        await responder(scope, receive, send)
+
 app = FastAPI(
     title="Bio Patrol",
     description="Bio-sensor patrol system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+@app.exception_handler(RobotNotFoundError)
+async def _robot_not_found(request, exc: RobotNotFoundError):
+    return ORJSONResponse({"detail": str(exc)}, status_code=404)
+
+# Map / laser / export payloads are large, highly compressible JSON
+app.add_middleware(_GZipExceptSSE, minimum_size=1024, compresslevel=5)
+
 # Include routers (before static files mount so API routes take priority)
 app.include_router(tasks.router)
 app.include_router(kachaka.router)
@@ -1,8 +1,34 @@
-from fastapi import APIRouter
+import asyncio
+import logging
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from dependencies import get_bio_sensor_client
+from utils.fast_json import dumps
+from utils.generate_fake_sensor_data import generate_fake_scan_tasks, get_db_path, init_database
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/bio-sensor', tags=['Bio Sensor'])
 
+_SCAN_FETCH_SIZE = 64
+
+def _scan_row_json(row) -> bytes:
+    return dumps({
+        "id": row[0],
+        "task_id": row[1],
+        "location_id": row[2],
+        "bed_name": row[3],
+        "timestamp": row[4],
+        "retry_count": row[5],
+        "status": row[6],
+        "bpm": row[7],
+        "rpm": row[8],
+        "is_valid": bool(row[9]),
+        "data_json": row[10],
+        "details": row[11]
+    })
+
 @router.get("/latest")
 async def get_latest_bio_sensor_data():
     """Get the latest bio-sensor data received via MQTT."""
@@ -23,60 +49,67 @@ async def get_bio_sensor_scan_history(limit: int = 100, task_id: str = None):
         client = get_bio_sensor_client()
         if client is None:
             return {"status": "disabled", "message": "Bio-sensor MQTT is disabled"}
-        import sqlite3
-
-        conn = sqlite3.connect(client.db_path)
-        cursor = conn.cursor()
-
-        if task_id:
-            search_pattern = f'{task_id}%'
-            cursor.execute('''
-                SELECT id, task_id, location_id, bed_name, timestamp, retry_count, status, bpm, rpm, is_valid, data_json, details
-                FROM sensor_scan_data
-                WHERE task_id LIKE ?
-                ORDER BY timestamp DESC, retry_count ASC
-                LIMIT ?
-            ''', (search_pattern, limit))
-        else:
-            cursor.execute('''
-                SELECT id, task_id, location_id, bed_name, timestamp, retry_count, status, bpm, rpm, is_valid, data_json, details
-                FROM sensor_scan_data
-                ORDER BY timestamp DESC, retry_count ASC
-                LIMIT ?
-            ''', (limit,))
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
-        rows = cursor.fetchall()
-        conn.close()
+    async def stream():
+        # The pooled connection is taken only once the body starts, so a
+        # client that disconnects before then never holds one
+        conn = None
+        count = 0
+        try:
+            try:
+                conn, cursor = await asyncio.to_thread(client.open_scan_history, limit, task_id)
+                rows = await asyncio.to_thread(cursor.fetchmany, _SCAN_FETCH_SIZE)
+            except Exception as e:
+                # Nothing sent yet: answer with the plain error envelope
+                yield dumps({"status": "error", "message": str(e)})
+                return
+            # Same envelope as before, written row batch by row batch
+            yield b'{"status":"success","data":['
+            while rows:
+                chunk = b",".join(_scan_row_json(row) for row in rows)
+                yield chunk if count == 0 else b"," + chunk
+                count += len(rows)
+                rows = await asyncio.to_thread(cursor.fetchmany, _SCAN_FETCH_SIZE)
+            yield b'],"count":%d}' % count
+        except Exception as e:
+            # Headers are already sent: close the JSON and report the failure in it
+            logger.error(f"Scan history stream aborted: {e}")
+            yield b'],"count":%d,"error":' % count + dumps(str(e)) + b"}"
+        finally:
+            if conn is not None:
+                cursor.close()  # ends the read transaction if we stopped early
+                client.release_scan_history(conn)
 
-        data = []
-        for row in rows:
-            data.append({
-                "id": row[0],
-                "task_id": row[1],
-                "location_id": row[2],
-                "bed_name": row[3],
-                "timestamp": row[4],
-                "retry_count": row[5],
-                "status": row[6],
-                "bpm": row[7],
-                "rpm": row[8],
-                "is_valid": bool(row[9]),
-                "data_json": row[10],
-                "details": row[11]
-            })
+    return StreamingResponse(stream(), media_type="application/json")
 
-        return {"status": "success", "data": data, "count": len(data)}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+async def _cancel_on_disconnect(request: Request, task: asyncio.Task, interval: float = 1.0):
+    while not task.done():
+        if await request.is_disconnected():
+            logger.info("Client disconnected, cancelling bio-sensor scan")
+            task.cancel()
+            return
+        await asyncio.sleep(interval)
 
 @router.get("/scan")
-async def get_bio_sensor_scan_data():
+async def get_bio_sensor_scan_data(request: Request):
     """Execute a bio-sensor scan task and return all collected data."""
     try:
         client = get_bio_sensor_client()
         if client is None:
             return {"status": "disabled", "message": "Bio-sensor MQTT is disabled"}
-        scan_result = await client.get_valid_scan_data()
+        # A scan can take minutes; stop it if the caller goes away
+        scan = asyncio.create_task(client.get_valid_scan_data())
+        watcher = asyncio.create_task(_cancel_on_disconnect(request, scan))
+        try:
+            await asyncio.wait({scan})
+        finally:
+            watcher.cancel()
+            scan.cancel()
+        if scan.cancelled():
+            return {"status": "cancelled", "message": "Client disconnected during scan"}
+        scan_result = scan.result()
 
         task_id = scan_result["task_id"]
         valid_data = scan_result["data"]
@@ -99,8 +132,6 @@ async def get_bio_sensor_scan_data():
 async def generate_fake_sensor_data(num_tasks: int = 10):
     """Generate fake sensor scan data for testing purposes."""
     try:
-        from utils.generate_fake_sensor_data import generate_fake_scan_tasks, get_db_path, init_database
-
         db_path = get_db_path()
         init_database(db_path)
         generate_fake_scan_tasks(db_path, num_tasks)
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Response, HTTPException, Depends
-from typing import Optional
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 from pydantic import BaseModel
-from services.fleet_api import FleetAPI
-from dependencies import get_fleet
+from google.protobuf.json_format import MessageToDict
+from services.fleet_api import FleetAPI, RobotNotFoundError
+from dependencies import fleet_dependency
+from utils.fast_json import dumps
 
 import asyncio
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -37,15 +40,92 @@ class ReturnShelfRequest(BaseModel):
 class ResetShelfPoseRequest(BaseModel):
     shelf_id: str
 
+# ---------------------------------------------------------------------------
+# Short-lived response cache for polled query endpoints
+# ---------------------------------------------------------------------------
+
+POSE_CACHE_TTL = 0.2     # pose / battery — dashboard polls every 2s
+STATIC_CACHE_TTL = 5.0   # map / locations / shelves — change rarely
+
+# (robot_id, endpoint) -> (expires_at, serialized body)
+_response_cache: Dict[Tuple[str, str], Tuple[float, bytes]] = {}
+_response_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+async def _cached_json(robot_id: str, endpoint: str, ttl: float,
+                       fetch: Callable[[str], Awaitable[dict]]) -> Response:
+    """Serve fetch(robot_id) from cache; concurrent misses share one fetch."""
+    key = (robot_id, endpoint)
+    hit = _response_cache.get(key)
+    if hit and hit[0] > time.monotonic():
+        return Response(content=hit[1], media_type="application/json")
+
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        hit = _response_cache.get(key)
+        if hit and hit[0] > time.monotonic():
+            return Response(content=hit[1], media_type="application/json")
+        result = await fetch(robot_id)
+        body = dumps(result)
+        # Don't pin failures — the next poll should retry the robot
+        if not isinstance(result, dict) or result.get("ok", True):
+            _response_cache[key] = (time.monotonic() + ttl, body)
+    return Response(content=body, media_type="application/json")
+
+# (robot_id, raw client method) -> (expires_at, protobuf reply)
+_proto_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+async def _cached_proto(fleet: FleetAPI, robot_id: str, method: str,
+                        ttl: float = POSE_CACHE_TTL):
+    """Call the raw client's ``method()`` at most once per ttl per robot.
+
+    The message itself is cached so each request can still pick JSON or
+    protobuf output.
+    """
+    fleet.get_raw_client(robot_id)  # unknown robot -> RobotNotFoundError
+    key = (robot_id, method)
+    hit = _proto_cache.get(key)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+
+    lock = _response_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        hit = _proto_cache.get(key)
+        if hit and hit[0] > time.monotonic():
+            return hit[1]
+        msg = await fleet.read_raw(robot_id, method)
+        _proto_cache[key] = (time.monotonic() + ttl, msg)
+    return msg
+
+def _invalidate_cache(robot_id: str) -> None:
+    """Drop cached responses for a robot after it was commanded."""
+    for cache in (_response_cache, _proto_cache):
+        for key in [k for k in cache if k[0] == robot_id]:
+            cache.pop(key, None)
+
+PROTOBUF_MEDIA_TYPE = "application/x-protobuf"
+
+# OpenAPI: raw-proto routes can also answer with the wire-format message
+_PROTO_RESPONSES = {200: {"content": {PROTOBUF_MEDIA_TYPE: {}}}}
+
+def _proto(msg, request: Optional[Request] = None) -> Response:
+    """Serialize a protobuf reply straight to JSON bytes.
+
+    Clients sending ``Accept: application/x-protobuf`` get the serialized
+    message instead, skipping the JSON conversion entirely.
+    """
+    if request is not None and PROTOBUF_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(content=msg.SerializeToString(), media_type=PROTOBUF_MEDIA_TYPE)
+    return Response(content=dumps(MessageToDict(msg)), media_type="application/json")
+
 # ====== Fleet Management APIs ======
 
 @router.get("/robots")
-async def get_all_robots(fleet: FleetAPI = Depends(get_fleet)):
+async def get_all_robots(fleet: FleetAPI = Depends(fleet_dependency)):
     """Get all registered robots"""
     return await fleet.get_all_robots()
 
 @router.post("/robots/register")
-async def register_robot(robot_id: str, url: str, name: Optional[str] = None, fleet: FleetAPI = Depends(get_fleet)):
+async def register_robot(robot_id: str, url: str, name: Optional[str] = None, fleet: FleetAPI = Depends(fleet_dependency)):
     """Register a new robot instance"""
     result = await fleet.register_robot(robot_id, url, name)
     if not result.get("ok"):
@@ -53,7 +133,7 @@ async def register_robot(robot_id: str, url: str, name: Optional[str] = None, fl
     return {"message": "Robot registered successfully"}
 
 @router.get("/robots/{robot_id}")
-async def get_robot_status(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def get_robot_status(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot status"""
     status = await fleet.get_robot_status(robot_id)
     if not status:
@@ -61,7 +141,7 @@ async def get_robot_status(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
     return status
 
 @router.put("/robots/{robot_id}/status")
-async def update_robot_status(robot_id: str, status: str, fleet: FleetAPI = Depends(get_fleet)):
+async def update_robot_status(robot_id: str, status: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Update robot status"""
     result = await fleet.update_robot_status(robot_id, status)
     if not result:
@@ -69,7 +149,7 @@ async def update_robot_status(robot_id: str, status: str, fleet: FleetAPI = Depe
     return {"message": "Robot status updated successfully"}
 
 @router.delete("/robots/{robot_id}")
-async def unregister_robot(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def unregister_robot(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Unregister an existing robot instance"""
     result = await fleet.unregister_robot(robot_id)
     if not result:
@@ -79,257 +159,191 @@ async def unregister_robot(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
 # ====== Robot Info APIs ======
 
 @router.get("/{robot_id}/serial_number")
-async def serial_number(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def serial_number(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot serial number"""
-    try:
-        return await fleet.get_serial_number(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_serial_number(robot_id)
 
 @router.get("/{robot_id}/version")
-async def version(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def version(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot version"""
-    try:
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_robot_version)
-        return res
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.read_raw(robot_id, "get_robot_version")
 
 @router.get("/{robot_id}/pose")
-async def robot_pose(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def robot_pose(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot pose"""
-    try:
-        return await fleet.get_pose(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _cached_json(robot_id, "pose", POSE_CACHE_TTL, fleet.get_pose)
 
 @router.get("/{robot_id}/battery")
-async def battery(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def battery(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot battery info"""
-    try:
-        return await fleet.get_battery_info(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _cached_json(robot_id, "battery", POSE_CACHE_TTL, fleet.get_battery_info)
+
+@router.get("/{robot_id}/summary")
+async def summary(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
+    """Get pose, battery, errors and command state in one round-trip"""
+    async def fetch(rid: str) -> dict:
+        parts = await asyncio.gather(
+            fleet.get_pose(rid),
+            fleet.get_battery_info(rid),
+            fleet.get_errors(rid),
+            fleet.get_command_state(rid),
+            return_exceptions=True,
+        )
+        for part in parts:
+            if isinstance(part, RobotNotFoundError):
+                raise part  # -> 404
+        pose, battery, errors, command_state = (
+            None if isinstance(p, Exception) else p for p in parts
+        )
+        return {
+            "ok": all(isinstance(p, dict) and p.get("ok", True) for p in parts),
+            "pose": pose,
+            "battery": battery,
+            "errors": errors,
+            "command_state": command_state,
+        }
+    return await _cached_json(robot_id, "summary", POSE_CACHE_TTL, fetch)
 
 @router.get("/{robot_id}/error/json")
-async def error_code_in_json(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def error_code_in_json(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot error code in JSON format"""
-    try:
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_robot_error_code)
-        return Response(content=json.dumps(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    res = await fleet.read_raw(robot_id, "get_robot_error_code")
+    # Keyed by int error code: stdlib json stringifies the keys, orjson would refuse them
+    return Response(content=json.dumps(res), media_type="application/json")
 
 @router.get("/{robot_id}/error")
-async def error(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def error(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot error info"""
-    try:
-        return await fleet.get_errors(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_errors(robot_id)
 
 @router.get("/{robot_id}/map")
-async def png_map(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def png_map(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot map"""
-    try:
-        return await fleet.get_map(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _cached_json(robot_id, "map", STATIC_CACHE_TTL, fleet.get_map)
 
 @router.get("/{robot_id}/map_list")
-async def map_list(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def map_list(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot map list"""
-    try:
-        return await fleet.get_map_list(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_map_list(robot_id)
 
-@router.get("/{robot_id}/export_map")
-async def export_map(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+@router.get("/{robot_id}/export_map", responses=_PROTO_RESPONSES)
+async def export_map(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Export robot map"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.export_map)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-@router.get("/{robot_id}/import_map")
-async def import_map(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+    client = fleet.get_raw_client(robot_id)
+    res = await asyncio.to_thread(client.export_map)
+    return _proto(res, request)
+
+@router.get("/{robot_id}/import_map", responses=_PROTO_RESPONSES)
+async def import_map(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Import robot map"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.import_map)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    client = fleet.get_raw_client(robot_id)
+    res = await asyncio.to_thread(client.import_map)
+    return _proto(res, request)
 
 # ====== ROS-level endpoints (raw SDK client) ======
 
-@router.get("/{robot_id}/imu")
-async def ros_imu_info(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+@router.get("/{robot_id}/imu", responses=_PROTO_RESPONSES)
+async def ros_imu_info(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot IMU info"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_ros_imu)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-@router.get("/{robot_id}/odometry")
-async def ros_odometry(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+    return _proto(await _cached_proto(fleet, robot_id, "get_ros_imu"), request)
+
+@router.get("/{robot_id}/odometry", responses=_PROTO_RESPONSES)
+async def ros_odometry(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot odometry info"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_ros_odometry)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-@router.get("/{robot_id}/wheel/odometry")
-async def ros_wheel_odometry(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+    return _proto(await _cached_proto(fleet, robot_id, "get_ros_odometry"), request)
+
+@router.get("/{robot_id}/wheel/odometry", responses=_PROTO_RESPONSES)
+async def ros_wheel_odometry(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot wheel odometry info"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_ros_wheel_odometry)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-@router.get("/{robot_id}/laser/scan")
-async def ros_laser_scan(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+    return _proto(await _cached_proto(fleet, robot_id, "get_ros_wheel_odometry"), request)
+
+@router.get("/{robot_id}/laser/scan", responses=_PROTO_RESPONSES)
+async def ros_laser_scan(robot_id: str, request: Request, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot laser scan info"""
-    try:
-        from google.protobuf.json_format import MessageToJson
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.get_ros_laser_scan)
-        return Response(content=MessageToJson(res), media_type='application/json')
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return _proto(await _cached_proto(fleet, robot_id, "get_ros_laser_scan"), request)
 
 # ====== Query APIs (kachaka_core — returns dicts) ======
 
 @router.get("/{robot_id}/locations")
-async def locations(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def locations(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot locations"""
-    try:
-        return await fleet.get_locations(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _cached_json(robot_id, "locations", STATIC_CACHE_TTL, fleet.get_locations)
 
 @router.get("/{robot_id}/shelves")
-async def shelves(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def shelves(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get robot shelves"""
-    try:
-        return await fleet.get_shelves(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await _cached_json(robot_id, "shelves", STATIC_CACHE_TTL, fleet.get_shelves)
 
 @router.get("/{robot_id}/shelves/moving")
-async def moving_shelf(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def moving_shelf(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get moving shelf ID"""
-    try:
-        return await fleet.get_moving_shelf(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_moving_shelf(robot_id)
 
 # ====== Robot Command APIs ======
 
 @router.post("/{robot_id}/command/speak")
-async def speak(robot_id: str, req: SpeakRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def speak(robot_id: str, req: SpeakRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Send speak command to robot"""
-    try:
-        return await fleet.speak(robot_id, req.text)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.speak(robot_id, req.text)
 
 @router.post("/{robot_id}/command/move_to_location")
-async def move_to_location(robot_id: str, req: MoveToLocationRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def move_to_location(robot_id: str, req: MoveToLocationRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Move robot to specified location"""
-    try:
-        return await fleet.move_to_location(robot_id, req.location_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.move_to_location(robot_id, req.location_id)
 
 @router.post("/{robot_id}/command/move_to_pose")
-async def move_to_pose(robot_id: str, req: MoveToPoseRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def move_to_pose(robot_id: str, req: MoveToPoseRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Move robot to specified pose"""
-    try:
-        return await fleet.move_to_pose(robot_id, req.x, req.y, req.yaw)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.move_to_pose(robot_id, req.x, req.y, req.yaw)
 
 @router.post("/{robot_id}/command/dock_shelf")
-async def dock_shelf(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def dock_shelf(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Dock robot to shelf"""
-    try:
-        return await fleet.dock_shelf(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.dock_shelf(robot_id)
 
 @router.post("/{robot_id}/command/undock_shelf")
-async def undock_shelf(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def undock_shelf(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Undock robot from shelf"""
-    try:
-        return await fleet.undock_shelf(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.undock_shelf(robot_id)
 
 @router.post("/{robot_id}/command/move_shelf")
-async def move_shelf(robot_id: str, req: MoveShelfRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def move_shelf(robot_id: str, req: MoveShelfRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Move shelf to specified location"""
-    try:
-        return await fleet.move_shelf(robot_id, req.shelf_id, req.location_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.move_shelf(robot_id, req.shelf_id, req.location_id)
 
 @router.post("/{robot_id}/command/return_shelf")
-async def return_shelf(robot_id: str, req: ReturnShelfRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def return_shelf(robot_id: str, req: ReturnShelfRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Return shelf to its original position"""
-    try:
-        return await fleet.return_shelf(robot_id, req.shelf_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.return_shelf(robot_id, req.shelf_id)
 
 @router.post("/{robot_id}/command/reset_shelf_pose")
-async def reset_shelf_pose(robot_id: str, req: ResetShelfPoseRequest, fleet: FleetAPI = Depends(get_fleet)):
+async def reset_shelf_pose(robot_id: str, req: ResetShelfPoseRequest, fleet: FleetAPI = Depends(fleet_dependency)):
     """Reset shelf pose"""
-    try:
-        client = fleet.get_raw_client(robot_id)
-        res = await asyncio.to_thread(client.reset_shelf_pose, req.shelf_id)
-        return res
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    client = fleet.get_raw_client(robot_id)
+    res = await asyncio.to_thread(client.reset_shelf_pose, req.shelf_id)
+    _invalidate_cache(robot_id)
+    return _proto(res)
 
 @router.post("/{robot_id}/command/return_home")
-async def return_home(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def return_home(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Return robot to home position"""
-    try:
-        return await fleet.return_home(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    _invalidate_cache(robot_id)
+    return await fleet.return_home(robot_id)
 
 # ====== Command State APIs ======
 
 @router.get("/{robot_id}/command/state")
-async def command_state(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def command_state(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get command state"""
-    try:
-        return await fleet.get_command_state(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_command_state(robot_id)
 
 @router.get("/{robot_id}/command/last")
-async def last_command_result(robot_id: str, fleet: FleetAPI = Depends(get_fleet)):
+async def last_command_result(robot_id: str, fleet: FleetAPI = Depends(fleet_dependency)):
     """Get last command result"""
-    try:
-        return await fleet.get_last_command_result(robot_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    return await fleet.get_last_command_result(robot_id)
@@ -8,21 +8,23 @@ import json
 import os
 import logging
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse, Response
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
 from typing import Optional
 
 from settings.config import (
     SETTINGS_FILE, BEDS_FILE, PATROL_FILE, SCHEDULE_FILE,
-    get_runtime_settings, get_settings_dir,
+    get_runtime_settings, get_settings_dir, invalidate_runtime_settings,
+    prime_runtime_settings,
 )
 from settings.defaults import DEFAULT_SETTINGS, DEFAULT_BEDS, DEFAULT_PATROL, DEFAULT_SCHEDULE
-from utils.json_io import load_json, save_json
+from utils.json_io import load_json, load_json_cached, save_json
+from utils.fast_json import ORJSONResponse, dumps
 from common_types import (
     Task, TaskStep, TaskStatus, StepStatus, generate_task_id,
 )
-from services.task_runtime import tasks_db, submit_task
+from services.task_runtime import tasks_db, tasks_by_status, submit_task, set_task_status
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,35 @@ MAPS_DIR = os.path.join(os.path.dirname(get_settings_dir()), "maps")
 router = APIRouter(prefix="/api", tags=["Settings & Config"])
 
 
+def _scan_json_files(directory: str) -> list:
+    """Return the *.json files in ``directory`` as DirEntry objects, sorted by name."""
+    with os.scandir(directory) as it:
+        return sorted(
+            (e for e in it if e.name.endswith(".json") and e.is_file()),
+            key=lambda e: e.name,
+        )
+
+
+def _write_settings(data: dict) -> dict:
+    """Save settings.json and refresh the cached runtime settings from ``data``.
+
+    The cache is keyed on mtime/size, which can miss a same-size rewrite
+    within the filesystem's timestamp granularity, so it is always reset
+    here. Unchanged content is not rewritten; that check reads the file
+    fresh for the same reason. Returns the merged runtime settings.
+    """
+    if os.path.exists(SETTINGS_FILE) and data == load_json(SETTINGS_FILE, {}):
+        return get_runtime_settings()
+    if save_json(SETTINGS_FILE, data):
+        merged = prime_runtime_settings(data)
+    else:
+        invalidate_runtime_settings()
+        merged = get_runtime_settings()
+    # The MQTT broker may have changed: drop idle test links to the old one
+    _prune_test_mqtt_links(keep=_configured_mqtt_key(merged))
+    return merged
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SETTINGS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -39,16 +70,14 @@ router = APIRouter(prefix="/api", tags=["Settings & Config"])
 @router.get("/settings")
 async def get_settings():
     """Return merged DEFAULT_SETTINGS + settings.json"""
-    return get_runtime_settings()
+    return ORJSONResponse(get_runtime_settings())
 
 
 @router.post("/settings")
 async def save_settings(body: dict):
     """Merge incoming JSON into settings.json and save."""
-    current = load_json(SETTINGS_FILE, {})
-    current.update(body)
-    save_json(SETTINGS_FILE, current)
-    return {"status": "ok", "data": get_runtime_settings()}
+    merged = {**load_json_cached(SETTINGS_FILE, {}), **body}
+    return {"status": "ok", "data": _write_settings(merged)}
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -58,10 +87,10 @@ async def save_settings(body: dict):
 @router.get("/beds")
 async def get_beds():
     """Return beds.json (or generate default)."""
-    data = load_json(BEDS_FILE, DEFAULT_BEDS)
+    data = load_json_cached(BEDS_FILE, DEFAULT_BEDS)
     if not data or data == {}:
         data = DEFAULT_BEDS
-    return data
+    return ORJSONResponse(data)
 
 
 @router.post("/beds")
@@ -78,10 +107,10 @@ async def save_beds(body: dict):
 @router.get("/patrol")
 async def get_patrol():
     """Return patrol.json."""
-    data = load_json(PATROL_FILE, DEFAULT_PATROL)
+    data = load_json_cached(PATROL_FILE, DEFAULT_PATROL)
     if not data or data == {}:
         data = DEFAULT_PATROL
-    return data
+    return ORJSONResponse(data)
 
 
 @router.post("/patrol")
@@ -100,19 +129,22 @@ PATROL_PRESETS_DIR = os.path.join(get_settings_dir(), "patrol_presets")
 @router.get("/patrol/presets")
 async def list_patrol_presets():
     """List saved patrol presets."""
-    os.makedirs(PATROL_PRESETS_DIR, exist_ok=True)
     cfg = get_runtime_settings()
     demo_preset = cfg.get("demo_preset", "")
-    presets = []
-    for fname in sorted(os.listdir(PATROL_PRESETS_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        fpath = os.path.join(PATROL_PRESETS_DIR, fname)
-        data = load_json(fpath, {})
-        name = fname[:-5]  # strip .json
-        enabled = [b for b in data.get("beds_order", []) if b.get("enabled")]
-        presets.append({"name": name, "beds_count": len(enabled)})
-    return {"presets": presets, "demo_preset": demo_preset}
+
+    def _scan() -> list:
+        os.makedirs(PATROL_PRESETS_DIR, exist_ok=True)
+        presets = []
+        for entry in _scan_json_files(PATROL_PRESETS_DIR):
+            data = load_json_cached(entry.path, {}, entry.stat())
+            name = entry.name[:-5]  # strip .json
+            enabled = [b for b in data.get("beds_order", []) if b.get("enabled")]
+            presets.append({"name": name, "beds_count": len(enabled)})
+        return presets
+
+    # Directory scan + one stat/read per preset: keep it off the event loop
+    presets = await asyncio.to_thread(_scan)
+    return ORJSONResponse({"presets": presets, "demo_preset": demo_preset})
 
 
 @router.post("/patrol/presets/{name}")
@@ -151,7 +183,7 @@ async def delete_patrol_preset(name: str):
     if cfg.get("demo_preset") == name:
         current = load_json(SETTINGS_FILE, {})
         current["demo_preset"] = ""
-        save_json(SETTINGS_FILE, current)
+        _write_settings(current)
     return {"status": "ok"}
 
 
@@ -163,7 +195,7 @@ async def set_demo_preset(name: str):
         raise HTTPException(status_code=404, detail="Preset not found")
     current = load_json(SETTINGS_FILE, {})
     current["demo_preset"] = name
-    save_json(SETTINGS_FILE, current)
+    _write_settings(current)
     return {"status": "ok", "demo_preset": name}
 
 
@@ -174,10 +206,10 @@ async def set_demo_preset(name: str):
 @router.get("/schedule")
 async def get_schedule():
     """Return schedule.json."""
-    data = load_json(SCHEDULE_FILE, DEFAULT_SCHEDULE)
+    data = load_json_cached(SCHEDULE_FILE, DEFAULT_SCHEDULE)
     if not data or data == {}:
         data = DEFAULT_SCHEDULE
-    return data
+    return ORJSONResponse(data)
 
 
 @router.post("/schedule")
@@ -199,6 +231,7 @@ async def delete_schedule_entry(schedule_id: str):
     data = load_json(SCHEDULE_FILE, DEFAULT_SCHEDULE)
     schedules = data.get("schedules", [])
     original_len = len(schedules)
+    # Filter every match: hand-edited or imported files can repeat an id
     schedules = [s for s in schedules if s.get("id") != schedule_id]
     if len(schedules) == original_len:
         raise HTTPException(status_code=404, detail=f"Schedule '{schedule_id}' not found")
@@ -236,13 +269,13 @@ async def start_patrol(req: PatrolStartRequest):
         demo_name = cfg.get("demo_preset", "")
         if demo_name:
             demo_path = os.path.join(PATROL_PRESETS_DIR, f"{demo_name}.json")
-            patrol_cfg = load_json(demo_path, DEFAULT_PATROL)
+            patrol_cfg = load_json_cached(demo_path, DEFAULT_PATROL)
         else:
-            patrol_cfg = load_json(PATROL_FILE, DEFAULT_PATROL)
+            patrol_cfg = load_json_cached(PATROL_FILE, DEFAULT_PATROL)
     else:
-        patrol_cfg = load_json(PATROL_FILE, DEFAULT_PATROL)
+        patrol_cfg = load_json_cached(PATROL_FILE, DEFAULT_PATROL)
 
-    beds_cfg = load_json(BEDS_FILE, DEFAULT_BEDS)
+    beds_cfg = load_json_cached(BEDS_FILE, DEFAULT_BEDS)
     beds_order = patrol_cfg.get("beds_order", [])
     beds_map = beds_cfg.get("beds", {})
 
@@ -250,51 +283,43 @@ async def start_patrol(req: PatrolStartRequest):
     if not enabled_beds:
         raise HTTPException(status_code=400, detail="No enabled beds in patrol config")
 
-    steps = []
-    step_counter = 0
+    # Steps are built from local constants, so skip pydantic validation
+    step = TaskStep.model_construct
+    pending = StepStatus.PENDING
+    is_demo = req.mode == "demo"
+    bed_count = len(enabled_beds)
+    steps = [None] * (2 * bed_count + 1)
 
-    for bed_entry in enabled_beds:
+    for i, bed_entry in enumerate(enabled_beds):
         bed_key = bed_entry["bed_key"]
         bed_info = beds_map.get(bed_key, {})
         location_id = bed_info.get("location_id", bed_key)
-
-        move_step_id = f"move_{step_counter}"
-        action_step_id = f"action_{step_counter}"
+        action_step_id = f"action_{i}"
 
         # move_shelf step — skip_on_failure points to the action step
-        move_step = TaskStep(
-            step_id=move_step_id,
+        steps[2 * i] = step(
+            step_id=f"move_{i}",
             action="move_shelf",
             params={"shelf_id": shelf_id, "location_id": location_id},
-            status=StepStatus.PENDING,
+            status=pending,
             skip_on_failure=[action_step_id],
         )
-        steps.append(move_step)
-
-        if req.mode == "demo":
-            action_step = TaskStep(
-                step_id=action_step_id,
-                action="wait",
-                params={"seconds": 5},
-                status=StepStatus.PENDING,
+        if is_demo:
+            steps[2 * i + 1] = step(
+                step_id=action_step_id, action="wait", params={"seconds": 5}, status=pending,
             )
         else:
-            action_step = TaskStep(
-                step_id=action_step_id,
-                action="bio_scan",
-                params={"bed_key": bed_key},
-                status=StepStatus.PENDING,
+            steps[2 * i + 1] = step(
+                step_id=action_step_id, action="bio_scan", params={"bed_key": bed_key}, status=pending,
             )
-        steps.append(action_step)
-        step_counter += 1
 
     # Final return_shelf step
-    steps.append(TaskStep(
-        step_id=f"return_{step_counter}",
+    steps[-1] = step(
+        step_id=f"return_{bed_count}",
         action="return_shelf",
         params={"shelf_id": shelf_id},
-        status=StepStatus.PENDING,
-    ))
+        status=pending,
+    )
 
     task = Task(
         task_id=generate_task_id(),
@@ -302,7 +327,6 @@ async def start_patrol(req: PatrolStartRequest):
         steps=steps,
         status=TaskStatus.QUEUED,
     )
-    tasks_db[task.task_id] = task
     await submit_task(task)
     logger.info(f"Patrol started (mode={req.mode}): task {task.task_id} with {len(enabled_beds)} beds")
     return {"status": "ok", "task_id": task.task_id, "mode": req.mode, "beds_count": len(enabled_beds)}
@@ -330,10 +354,9 @@ async def recover_shelf(req: RecoverShelfRequest):
 
         if result.success:
             # Clear shelf_drop status from any active task
-            for task in tasks_db.values():
-                if task.status and task.status.value == "shelf_dropped":
-                    task.status = TaskStatus.DONE
-                    break
+            for task in list(tasks_by_status[TaskStatus.SHELF_DROPPED].values()):
+                set_task_status(task, TaskStatus.DONE)
+                break
             return {"status": "ok", "message": "Shelf pose reset successfully"}
         else:
             return {"status": "error", "message": f"Recovery failed: error {result.error_code}"}
@@ -387,7 +410,7 @@ async def resume_patrol(req: ResumePatrolRequest):
         raise HTTPException(status_code=500, detail=f"Shelf reset failed: {e}")
 
     # Step 2: Mark old task as DONE
-    old_task.status = TaskStatus.DONE
+    set_task_status(old_task, TaskStatus.DONE)
 
     # Step 3: Build new task with remaining beds
     steps = []
@@ -433,7 +456,6 @@ async def resume_patrol(req: ResumePatrolRequest):
         steps=steps,
         status=TaskStatus.QUEUED,
     )
-    tasks_db[new_task.task_id] = new_task
 
     # Step 4: Queue
     await submit_task(new_task)
@@ -451,10 +473,128 @@ async def resume_patrol(req: ResumePatrolRequest):
 # MQTT TEST (SSE)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _sse_event(msg: str, level: str = "info") -> str:
-    """Format a Server-Sent Event line."""
-    payload = json.dumps({"msg": msg, "level": level})
-    return f"data: {payload}\n\n"
+def _sse_event(msg: str, level: str = "info") -> bytes:
+    """Format a Server-Sent Event line as ready-to-send bytes."""
+    return b"data: " + dumps({"msg": msg, "level": level}) + b"\n\n"
+
+
+_MQTT_CONNECT_TIMEOUT = 5
+
+
+class _TestMQTTLink:
+    """MQTT connection kept open between test runs for one broker.
+
+    Each test registers a listener for its topic instead of installing its
+    own on_message, so concurrent tests can share the connection.
+    """
+
+    def __init__(self, broker: str, port: int):
+        import paho.mqtt.client as mqtt
+
+        self._loop = asyncio.get_running_loop()
+        self._connected = asyncio.Event()
+        self._topic_matches = mqtt.topic_matches_sub
+        self.connect_rc = None
+        self.listeners = {}  # callback -> subscribed topic
+        self.client = mqtt.Client(protocol=mqtt.MQTTv31)
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+        self.broker = broker
+        self.port = port
+
+    def _on_connect(self, client, userdata, flags, rc, properties=None):
+        self.connect_rc = rc
+        self._loop.call_soon_threadsafe(self._connected.set)
+
+    def _on_message(self, client, userdata, msg):
+        for callback, topic in list(self.listeners.items()):
+            if self._topic_matches(topic, msg.topic):
+                callback(msg)
+
+    async def add_listener(self, callback, topic: str):
+        """Subscribe to ``topic`` and route its messages to ``callback``."""
+        self.listeners[callback] = topic
+        # Subscribing again is harmless and replays retained messages
+        await asyncio.to_thread(self.client.subscribe, topic)
+
+    def remove_listener(self, callback):
+        """Drop a listener, unsubscribing once nothing else wants its topic."""
+        topic = self.listeners.pop(callback, None)
+        if topic is not None and topic not in self.listeners.values():
+            self.client.unsubscribe(topic)
+
+    async def connect(self):
+        """Connect and wait for CONNACK; raises on failure or timeout."""
+        await asyncio.to_thread(self.client.connect, self.broker, self.port, 60)
+        self.client.loop_start()
+        async with asyncio.timeout(_MQTT_CONNECT_TIMEOUT):
+            await self._connected.wait()
+        if self.connect_rc != 0:
+            raise ConnectionError(f"rc={self.connect_rc}")
+
+    def close(self):
+        # disconnect() first wakes the network thread, so loop_stop() joins promptly
+        self.client.disconnect()
+        self.client.loop_stop()
+
+
+# (broker, port) -> _TestMQTTLink
+_test_mqtt_links = {}
+_test_mqtt_lock = asyncio.Lock()
+
+
+def _configured_mqtt_key(cfg: dict):
+    try:
+        return cfg.get("mqtt_broker", "localhost"), int(cfg.get("mqtt_port", 1883))
+    except (TypeError, ValueError):
+        return None
+
+
+def _prune_test_mqtt_links(keep=None):
+    """Close idle links for any broker other than ``keep``.
+
+    ``keep`` defaults to the configured broker, so links left over from an
+    old mqtt_broker/mqtt_port go away once no test is using them.
+    """
+    if keep is None:
+        keep = _configured_mqtt_key(get_runtime_settings())
+    for key, link in list(_test_mqtt_links.items()):
+        if key != keep and not link.listeners:
+            del _test_mqtt_links[key]
+            link.close()
+
+
+def _release_test_mqtt_link(link: "_TestMQTTLink", callback):
+    """End one test's use of ``link``."""
+    link.remove_listener(callback)
+    _prune_test_mqtt_links()
+
+
+async def _get_test_mqtt_link(broker: str, port: int):
+    """Return (link, reused) for the broker, connecting only if needed."""
+    key = (broker, port)
+    _prune_test_mqtt_links(keep=key)
+    async with _test_mqtt_lock:
+        link = _test_mqtt_links.get(key)
+        if link is not None and link.client.is_connected():
+            return link, True
+        if link is not None:
+            _test_mqtt_links.pop(key).close()
+        link = _TestMQTTLink(broker, port)
+        try:
+            await link.connect()
+        except BaseException:
+            link.close()
+            raise
+        _test_mqtt_links[key] = link
+        return link, False
+
+
+def close_test_mqtt_links():
+    """Disconnect the cached test connections (called on app shutdown)."""
+    while _test_mqtt_links:
+        _, link = _test_mqtt_links.popitem()
+        link.close()
 
 
 @router.get("/settings/test-mqtt")
@@ -466,71 +606,50 @@ async def test_mqtt():
     topic = cfg.get("mqtt_topic", "")
 
     async def generate():
-        import paho.mqtt.client as mqtt
-
         received = []
-        connected_event = asyncio.Event()
-        connect_error = {}
-
-        def on_connect(client, userdata, flags, rc, properties=None):
-            if rc == 0:
-                connected_event.set()
-            else:
-                connect_error["rc"] = rc
-                connected_event.set()
+        got_data = asyncio.Event()
+        loop = asyncio.get_running_loop()
 
-        def on_message(client, userdata, msg):
+        def on_message(msg):
             try:
                 payload = msg.payload.decode()
                 received.append(payload)
             except Exception:
                 received.append(str(msg.payload))
+            loop.call_soon_threadsafe(got_data.set)
 
         yield _sse_event(f"Connecting to {broker}:{port}...")
         await asyncio.sleep(0)
 
-        client = mqtt.Client(protocol=mqtt.MQTTv31)
-        client.on_connect = on_connect
-        client.on_message = on_message
-
-        try:
-            await asyncio.to_thread(client.connect, broker, port, 60)
-            client.loop_start()
-        except Exception as e:
-            yield _sse_event(f"Connection failed: {e}", "error")
-            yield _sse_event("Test complete.", "done")
-            return
-
-        # Wait for connect callback (up to 5s)
         try:
-            await asyncio.wait_for(connected_event.wait(), timeout=5)
-        except asyncio.TimeoutError:
-            yield _sse_event("Connection timed out (5s)", "error")
-            client.loop_stop()
-            client.disconnect()
+            link, reused = await _get_test_mqtt_link(broker, port)
+        except TimeoutError:
+            yield _sse_event(f"Connection timed out ({_MQTT_CONNECT_TIMEOUT}s)", "error")
             yield _sse_event("Test complete.", "done")
             return
-
-        if connect_error:
-            yield _sse_event(f"Connection failed: rc={connect_error['rc']}", "error")
-            client.loop_stop()
-            client.disconnect()
+        except Exception as e:
+            yield _sse_event(f"Connection failed: {e}", "error")
             yield _sse_event("Test complete.", "done")
             return
 
-        yield _sse_event("Connected successfully")
+        yield _sse_event("Connected (reusing open connection)" if reused else "Connected successfully")
 
         yield _sse_event(f"Subscribing to {topic}...")
-        await asyncio.to_thread(client.subscribe, topic)
-        yield _sse_event("Subscribed. Waiting for data (15s timeout)...")
-
-        # Wait up to 15s for data, checking every second
-        for i in range(15):
-            await asyncio.sleep(1)
-            if received:
-                break
-            if i % 5 == 4:
-                yield _sse_event(f"  Still waiting... ({i + 1}s)")
+        try:
+            await link.add_listener(on_message, topic)
+            yield _sse_event("Subscribed. Waiting for data (15s timeout)...")
+
+            # Wait up to 15s for data, reporting progress every 5s
+            for elapsed in (5, 10, 15):
+                try:
+                    async with asyncio.timeout(5):
+                        await got_data.wait()
+                    break
+                except TimeoutError:
+                    if elapsed < 15:
+                        yield _sse_event(f"  Still waiting... ({elapsed}s)")
+        finally:
+            _release_test_mqtt_link(link, on_message)
 
         if received:
             yield _sse_event(f"Received {len(received)} message(s):")
@@ -541,9 +660,6 @@ async def test_mqtt():
         else:
             yield _sse_event("No data received within timeout", "warn")
 
-        yield _sse_event("Disconnecting...")
-        client.loop_stop()
-        client.disconnect()
         yield _sse_event("Test complete.", "done")
 
     return StreamingResponse(generate(), media_type="text/event-stream")
@@ -566,25 +682,14 @@ async def test_bio_scan():
     valid_status = int(cfg.get("bio_scan_valid_status", 4))
 
     async def generate():
-        import paho.mqtt.client as mqtt
-
         yield _sse_event(
             f"Config: initial_wait={initial_wait}s, retry_count={retry_count}, "
             f"wait_time={wait_time}s, valid_status={valid_status}"
         )
 
         latest_data = {}
-        connected_event = asyncio.Event()
-        connect_error = {}
-
-        def on_connect(client, userdata, flags, rc, properties=None):
-            if rc == 0:
-                connected_event.set()
-            else:
-                connect_error["rc"] = rc
-                connected_event.set()
 
-        def on_message(client, userdata, msg):
+        def on_message(msg):
             try:
                 latest_data["value"] = json.loads(msg.payload.decode())
             except Exception:
@@ -593,45 +698,39 @@ async def test_bio_scan():
         yield _sse_event(f"Connecting to MQTT {broker}:{port}...")
         await asyncio.sleep(0)
 
-        client = mqtt.Client(protocol=mqtt.MQTTv31)
-        client.on_connect = on_connect
-        client.on_message = on_message
-
         try:
-            await asyncio.to_thread(client.connect, broker, port, 60)
-            client.loop_start()
+            link, reused = await _get_test_mqtt_link(broker, port)
+        except TimeoutError:
+            yield _sse_event("MQTT connection timed out", "error")
+            yield _sse_event("Test complete.", "done")
+            return
         except Exception as e:
             yield _sse_event(f"MQTT connection failed: {e}", "error")
             yield _sse_event("Test complete.", "done")
             return
 
+        yield _sse_event("MQTT connected (reusing open connection)" if reused else "MQTT connected")
         try:
-            await asyncio.wait_for(connected_event.wait(), timeout=5)
-        except asyncio.TimeoutError:
-            yield _sse_event("MQTT connection timed out", "error")
-            client.loop_stop()
-            client.disconnect()
-            yield _sse_event("Test complete.", "done")
-            return
-
-        if connect_error:
-            yield _sse_event(f"MQTT connection failed: rc={connect_error['rc']}", "error")
-            client.loop_stop()
-            client.disconnect()
-            yield _sse_event("Test complete.", "done")
-            return
+            await link.add_listener(on_message, topic)
+            yield _sse_event(f"Subscribed to {topic}")
+            async for line in _bio_scan_cycle(latest_data):
+                yield line
+        finally:
+            _release_test_mqtt_link(link, on_message)
+        yield _sse_event("Test complete.", "done")
 
-        yield _sse_event("MQTT connected")
-        await asyncio.to_thread(client.subscribe, topic)
-        yield _sse_event(f"Subscribed to {topic}")
+    async def _bio_scan_cycle(latest_data):
 
         # Initial wait with countdown
         yield _sse_event(f"Starting initial wait ({initial_wait}s)...")
-        for elapsed in range(initial_wait):
-            await asyncio.sleep(1)
-            remaining = initial_wait - elapsed - 1
-            if remaining > 0 and remaining % 10 == 0:
-                yield _sse_event(f"  Initial wait: {remaining}s remaining...")
+        # Sleep straight to each 10s progress mark, anchored to one monotonic
+        # deadline so per-tick overhead doesn't stretch the wait past initial_wait
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + initial_wait
+        for remaining in range((initial_wait - 1) // 10 * 10, 0, -10):
+            await asyncio.sleep(max(0.0, deadline - remaining - loop.time()))
+            yield _sse_event(f"  Initial wait: {remaining}s remaining...")
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
 
         yield _sse_event("Initial wait complete. Starting scan retries...")
 
@@ -670,10 +769,6 @@ async def test_bio_scan():
         else:
             yield _sse_event("Result: No valid data after all retries", "warn")
 
-        client.loop_stop()
-        client.disconnect()
-        yield _sse_event("Test complete.", "done")
-
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 
@@ -684,18 +779,15 @@ async def test_bio_scan():
 
 def _save_map_png_and_meta(map_pb, robot_map_id: str, locations: list, entry_name: str = "") -> dict:
     """Save a protobuf Map to data/maps/ as PNG + JSON. Returns metadata dict."""
-    import base64
-    from google.protobuf.json_format import MessageToDict
-
-    map_dict = MessageToDict(map_pb, preserving_proto_field_name=True)
-    resolution = map_dict.get("resolution", 0.05)
-    width = map_dict.get("width", 0)
-    height = map_dict.get("height", 0)
-    map_name = entry_name or map_dict.get("name", "robot_map")
-    origin_dict = map_dict.get("origin", {})
-
-    png_b64 = map_dict.get("data", "")
-    png_bytes = base64.b64decode(png_b64) if png_b64 else b""
+    # Read the proto fields directly: `data` is already PNG bytes, so there is
+    # no need to round-trip the whole map through a dict and base64.
+    resolution = map_pb.resolution or 0.05
+    width = map_pb.width
+    height = map_pb.height
+    map_name = entry_name or map_pb.name or "robot_map"
+    origin = map_pb.origin
+
+    png_bytes = map_pb.data
     if not png_bytes:
         return None
 
@@ -712,7 +804,7 @@ def _save_map_png_and_meta(map_pb, robot_map_id: str, locations: list, entry_nam
         "resolution": resolution,
         "width": width,
         "height": height,
-        "origin": {"x": origin_dict.get("x", 0), "y": origin_dict.get("y", 0)},
+        "origin": {"x": origin.x, "y": origin.y},
         "locations": locations,
         "timestamp": datetime.now().isoformat(),
     }
@@ -726,14 +818,13 @@ async def list_maps():
     cfg = get_runtime_settings()
     active_map = cfg.get("active_map", "")
 
-    maps = []
-    os.makedirs(MAPS_DIR, exist_ok=True)
-    for fname in sorted(os.listdir(MAPS_DIR)):
-        if fname.endswith(".json"):
-            meta_path = os.path.join(MAPS_DIR, fname)
+    def _scan() -> list:
+        maps = []
+        os.makedirs(MAPS_DIR, exist_ok=True)
+        for entry in _scan_json_files(MAPS_DIR):
             try:
-                meta = load_json(meta_path, {})
-                map_id = fname.replace(".json", "")
+                meta = load_json_cached(entry.path, {}, entry.stat())
+                map_id = entry.name[:-5]  # strip .json
                 maps.append({
                     "id": map_id,
                     "name": meta.get("name", map_id),
@@ -745,8 +836,13 @@ async def list_maps():
                 })
             except Exception:
                 pass
+        return maps
+
+    maps = await asyncio.to_thread(_scan)
+    return ORJSONResponse({"active_map": active_map, "maps": maps})
 
-    return {"active_map": active_map, "maps": maps}
+
+_MAP_FETCH_CONCURRENCY = 4
 
 
 @router.post("/maps/fetch")
@@ -757,17 +853,20 @@ async def fetch_maps_from_robot():
     fleet = get_fleet()
 
     # 0. Clear old map data
-    if os.path.isdir(MAPS_DIR):
-        for fname in os.listdir(MAPS_DIR):
-            fpath = os.path.join(MAPS_DIR, fname)
-            if os.path.isfile(fpath):
-                os.remove(fpath)
+    def _clear_maps_dir():
+        if os.path.isdir(MAPS_DIR):
+            for fname in os.listdir(MAPS_DIR):
+                fpath = os.path.join(MAPS_DIR, fname)
+                if os.path.isfile(fpath):
+                    os.remove(fpath)
+
+    await asyncio.to_thread(_clear_maps_dir)
 
     # Clear active_map since old files are gone
     current_settings = load_json(SETTINGS_FILE, {})
     if current_settings.get("active_map"):
         current_settings["active_map"] = ""
-        save_json(SETTINGS_FILE, current_settings)
+        _write_settings(current_settings)
 
     # 1. Get list of maps on robot (kachaka_core returns dict)
     try:
@@ -796,34 +895,42 @@ async def fetch_maps_from_robot():
     except Exception:
         pass
 
-    # 4. For each map, load preview via raw SDK and save PNG + metadata
-    saved = []
+    # 4. For each map, load preview via raw SDK and save PNG + metadata.
+    # Maps are fetched concurrently (a few at a time); decoding and file
+    # writes run in worker threads.
     client = fleet.get_raw_client("kachaka")
-    for entry in maps:
+    limit = asyncio.Semaphore(_MAP_FETCH_CONCURRENCY)
+
+    async def _fetch_one(entry):
         robot_map_id = entry.get("id", "")
         entry_name = entry.get("name", "")
         if not robot_map_id:
-            continue
+            return None
 
-        try:
-            map_pb = await asyncio.to_thread(client.load_map_preview, robot_map_id)
-        except Exception as e:
-            logger.warning(f"load_map_preview error for {robot_map_id}: {e}")
-            continue
+        async with limit:
+            try:
+                map_pb = await asyncio.to_thread(client.load_map_preview, robot_map_id)
+            except Exception as e:
+                logger.warning(f"load_map_preview error for {robot_map_id}: {e}")
+                return None
 
         # Attach locations only for the current map
         locs = locations if robot_map_id == current_map_id else []
-        meta = _save_map_png_and_meta(map_pb, robot_map_id, locs, entry_name)
-        if meta:
-            saved.append({
-                "id": meta["id"],
-                "name": meta["name"],
-                "robot_map_id": robot_map_id,
-                "timestamp": meta["timestamp"],
-                "resolution": meta["resolution"],
-                "width": meta["width"],
-                "height": meta["height"],
-            })
+        meta = await asyncio.to_thread(_save_map_png_and_meta, map_pb, robot_map_id, locs, entry_name)
+        if not meta:
+            return None
+        return {
+            "id": meta["id"],
+            "name": meta["name"],
+            "robot_map_id": robot_map_id,
+            "timestamp": meta["timestamp"],
+            "resolution": meta["resolution"],
+            "width": meta["width"],
+            "height": meta["height"],
+        }
+
+    results = await asyncio.gather(*(_fetch_one(entry) for entry in maps))
+    saved = [r for r in results if r]
 
     return {"status": "ok", "current_robot_map": current_map_id, "maps": saved}
 
@@ -838,7 +945,7 @@ async def switch_map(req: SwitchMapRequest):
     from dependencies import get_fleet
 
     meta_path = os.path.join(MAPS_DIR, f"{req.map_id}.json")
-    meta = load_json(meta_path, None)
+    meta = load_json_cached(meta_path, None)
     if not meta:
         raise HTTPException(status_code=404, detail=f"Map '{req.map_id}' not found")
 
@@ -864,7 +971,7 @@ async def switch_map(req: SwitchMapRequest):
     # Set as active map in settings
     current = load_json(SETTINGS_FILE, {})
     current["active_map"] = req.map_id
-    save_json(SETTINGS_FILE, current)
+    _write_settings(current)
 
     return {"status": "ok", "active_map": req.map_id, "robot_map_id": robot_map_id}
 
@@ -882,7 +989,7 @@ async def set_active_map(req: SetActiveMapRequest):
 
     current = load_json(SETTINGS_FILE, {})
     current["active_map"] = req.map_id
-    save_json(SETTINGS_FILE, current)
+    _write_settings(current)
     return {"status": "ok", "active_map": req.map_id}
 
 
@@ -895,11 +1002,11 @@ async def get_active_map_info():
         raise HTTPException(status_code=404, detail="No active map set")
 
     meta_path = os.path.join(MAPS_DIR, f"{map_id}.json")
-    meta = load_json(meta_path, None)
+    meta = load_json_cached(meta_path, None)
     if not meta:
         raise HTTPException(status_code=404, detail=f"Map metadata not found: {map_id}")
 
-    return {
+    return ORJSONResponse({
         "status": "ok",
         "map_id": map_id,
         "name": meta.get("name", ""),
@@ -908,16 +1015,22 @@ async def get_active_map_info():
         "height": meta.get("height", 0),
         "origin": meta.get("origin", {"x": 0, "y": 0}),
         "locations": meta.get("locations", []),
-    }
+    })
 
 
 @router.get("/maps/{map_id}/image")
-async def get_map_image(map_id: str):
+async def get_map_image(map_id: str, request: Request):
     """Serve a saved map PNG file."""
     png_path = os.path.join(MAPS_DIR, f"{map_id}.png")
-    if not os.path.exists(png_path):
+    try:
+        st = await asyncio.to_thread(os.stat, png_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Map image not found: {map_id}")
 
-    with open(png_path, "rb") as f:
-        png_bytes = f.read()
-    return Response(content=png_bytes, media_type="image/png")
+    # Re-fetching maps from the robot overwrites the PNG in place, so clients
+    # revalidate every time and get a 304 while the file is unchanged.
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"Cache-Control": "no-cache", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(png_path, media_type="image/png", headers=headers, stat_result=st)
@@ -1,21 +1,45 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 router = APIRouter(prefix='/api', tags=['Tasks Scheduler'])
 
+import os
 import uuid
+from collections import deque
+from itertools import dropwhile, islice
 
 import logging
 logger = logging.getLogger(__name__)
 
-from typing import List
+from typing import Optional
 
-from common_types import Task, TaskStatus, validate_task_conditional_logic
-from services.task_runtime import tasks_db, submit_task, current_tasks
+from common_types import Task, TaskStatus, TASK_LIST_ADAPTER, validate_task_conditional_logic
+from services.task_runtime import (
+    tasks_db, submit_task, current_tasks, set_task_status, remove_task,
+)
+
+
+# Task ids are drawn from a pool filled by one os.urandom() call per batch
+_UUID_BATCH = 256
+_uuid_pool: deque = deque()
+
+def _next_task_id() -> str:
+    if not _uuid_pool:
+        buf = os.urandom(16 * _UUID_BATCH)
+        _uuid_pool.extend(
+            str(uuid.UUID(bytes=buf[i:i + 16], version=4))
+            for i in range(0, len(buf), 16)
+        )
+    return _uuid_pool.popleft()
+
+
+def _task_response(task: Task) -> Response:
+    """Serialize a task in pydantic-core, skipping the intermediate dict."""
+    return Response(content=task.model_dump_json(), media_type="application/json")
 
 
 # --- RESTful APIs Interfaces ---
-@router.post("/tasks", response_model=Task)
+@router.post("/tasks")
 async def create_task(task_input: Task):
-    task_id = str(uuid.uuid4())
+    task_id = _next_task_id()
 
     # Default robot_id to "kachaka" (single robot system)
     if not task_input.robot_id:
@@ -28,29 +52,55 @@ async def create_task(task_input: Task):
         logger.warning(f"Task creation failed: {error_message}")
         raise HTTPException(status_code=400, detail=error_message)
     
-    # Create a new task instance from the input, preserving robot_id if specified
-    new_task = Task(
-        task_id=task_id, 
-        steps=task_input.steps, 
-        status=TaskStatus.QUEUED,
-        robot_id=task_input.robot_id  # Preserve robot_id from input
-    )
-    await submit_task(new_task)
-    logger.info(f"Task {task_id} created and submitted.")
-    return new_task
-
-@router.get("/tasks", response_model=List[Task])
-def list_tasks():
-    return list(tasks_db.values())
-
-@router.get("/tasks/{task_id}", response_model=Task)
+    # Request body is already a validated Task — fill in server-side fields
+    task_input.task_id = task_id
+    task_input.status = TaskStatus.QUEUED
+    task_input.metadata = None  # server-managed (shelf-drop state)
+    await submit_task(task_input)
+    logger.debug(f"Task {task_id} created and submitted.")
+    return _task_response(task_input)
+
+@router.get("/tasks")
+async def list_tasks(
+    status: Optional[TaskStatus] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+):
+    """List tasks in submission order.
+
+    Without ``limit`` every task is returned (what the dashboard expects).
+    With ``limit``, a full page sets ``X-Next-Cursor`` to the last task_id;
+    pass it back as ``cursor`` to continue after that task.
+
+    A ``status`` filter walks ``tasks_db`` rather than the status index,
+    whose buckets reorder on every transition, so filtered pages keep
+    submission order and a cursor stays valid after its task changes state.
+    """
+    items = iter(tasks_db.values())
+    if cursor is not None:
+        if cursor not in tasks_db:
+            raise HTTPException(status_code=400, detail=f"Unknown cursor '{cursor}'")
+        items = dropwhile(lambda t: t.task_id != cursor, items)
+        next(items, None)  # the cursor task itself was on the previous page
+    if status is not None:
+        items = (t for t in items if t.status == status)
+    stop = offset + limit if limit is not None else None
+    page = list(islice(items, offset, stop))
+
+    headers = {}
+    if limit is not None and len(page) == limit:
+        headers["X-Next-Cursor"] = page[-1].task_id
+    return Response(content=TASK_LIST_ADAPTER.dump_json(page), media_type="application/json", headers=headers)
+
+@router.get("/tasks/{task_id}")
 async def get_task(task_id: str):
     task = tasks_db.get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return _task_response(task)
 
-@router.post("/tasks/{task_id}/cancel", response_model=Task)
+@router.post("/tasks/{task_id}/cancel")
 async def cancel_task(task_id: str):
     task = tasks_db.get(task_id)
     if not task:
@@ -63,10 +113,9 @@ async def cancel_task(task_id: str):
     
     if task.status == TaskStatus.CANCELLED:
         logger.info(f"Task {task_id} is already cancelled.")
-        return task # Already cancelled
+        return _task_response(task) # Already cancelled
 
-    task.status = TaskStatus.CANCELLED
-    tasks_db[task_id] = task # Update in DB
+    set_task_status(task, TaskStatus.CANCELLED)
     logger.info(f"Task {task_id} status set to CANCELLED.")
 
     # If task is actively running, send cancel_command to stop the robot
@@ -79,7 +128,7 @@ async def cancel_task(task_id: str):
         except Exception as e:
             logger.warning(f"Failed to send cancel_command for task {task_id}: {e}")
 
-    return task
+    return _task_response(task)
 
 @router.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
@@ -91,9 +140,9 @@ async def delete_task(task_id: str):
     
     # Attempt to cancel if it's in a state that can be cancelled
     if task.status not in [TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-        task.status = TaskStatus.CANCELLED
+        set_task_status(task, TaskStatus.CANCELLED)
         logger.info(f"Task {task_id} marked as CANCELLED before deletion.")
 
-    tasks_db.pop(task_id, None)
+    remove_task(task_id)
     logger.info(f"Task {task_id} deleted from tasks_db.")
     return {"message": f"Task {task_id} deleted (or marked as cancelled if it was active)."}
@@ -6,16 +6,40 @@ import paho.mqtt.client as mqtt
 import logging
 import os
 import asyncio
+import queue
 import sqlite3
 from common_types import get_now
 
 logger = logging.getLogger("BioSensorMQTTClient")
 
+# Idle read connections kept open for scan-history queries
+_READ_POOL_SIZE = 4
+
+# Write batching: flush after this many rows or this many seconds
+_WRITE_BATCH_SIZE = 64
+_WRITE_BATCH_WINDOW = 0.1
+# Queued by stop_writer() to end the writer loop after its current batch
+_WRITER_STOP = object()
+
+_INSERT_SCAN_SQL = '''
+    INSERT INTO sensor_scan_data
+    (task_id, location_id, bed_name, timestamp, retry_count, status, bpm, rpm, data_json, is_valid, details)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SCAN_HISTORY_COLUMNS = (
+    "id, task_id, location_id, bed_name, timestamp, retry_count, "
+    "status, bpm, rpm, is_valid, data_json, details"
+)
+
 class BioSensorMQTTClient:
-    def __init__(self, broker="localhost", port=1803, topic="/my/default/channel", db_path=None):
+    def __init__(self, broker="localhost", port=1803, topic="/my/default/channel", db_path=None, qos=0):
         self.broker = broker
         self.port = port
         self.topic = topic
+        # QoS 0: the broker pushes without a PUBACK round-trip per reading;
+        # only latest_data is kept, so a dropped sample is superseded anyway
+        self.qos = qos
         if db_path is None:
             # From src/backend/services/bio_sensor_mqtt.py → up 4 levels to project root
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -31,10 +55,18 @@ class BioSensorMQTTClient:
         self.client.on_message = self._on_message
         self.latest_data = None
         self.connected = False
+        # Replaced-and-set on every message so all current waiters wake up
+        self._data_event = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop = None
+        self._read_pool = queue.Queue(maxsize=_READ_POOL_SIZE)
+        self._write_queue: asyncio.Queue = None
+        self._writer_task: asyncio.Task = None
         self._init_database()
     
     def _init_database(self):
         conn = sqlite3.connect(self.db_path)
+        # WAL is persistent in the DB file: readers no longer block on writers
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS sensor_scan_data (
@@ -64,13 +96,67 @@ class BioSensorMQTTClient:
             conn.commit()
         except sqlite3.OperationalError:
             pass  # column already renamed or doesn't exist
+        # Serves ORDER BY timestamp DESC, retry_count ASC without a sort step
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scan_ts "
+            "ON sensor_scan_data(timestamp DESC, retry_count)"
+        )
         conn.commit()
         conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+
+    def _acquire_reader(self):
+        try:
+            return self._read_pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release_reader(self, conn):
+        try:
+            self._read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def open_scan_history(self, limit=100, task_id=None):
+        """Run the scan-history query, newest first, on a pooled connection.
+
+        Returns (conn, cursor); fetch from the cursor, then hand conn back with
+        release_scan_history(). Blocking — call via asyncio.to_thread().
+        """
+        conn = self._acquire_reader()
+        try:
+            if task_id:
+                cursor = conn.execute(f'''
+                    SELECT {_SCAN_HISTORY_COLUMNS}
+                    FROM sensor_scan_data
+                    WHERE task_id LIKE ?
+                    ORDER BY timestamp DESC, retry_count ASC
+                    LIMIT ?
+                ''', (f'{task_id}%', limit))
+            else:
+                cursor = conn.execute(f'''
+                    SELECT {_SCAN_HISTORY_COLUMNS}
+                    FROM sensor_scan_data
+                    ORDER BY timestamp DESC, retry_count ASC
+                    LIMIT ?
+                ''', (limit,))
+        except Exception:
+            self._release_reader(conn)
+            raise
+        return conn, cursor
+
+    def release_scan_history(self, conn):
+        self._release_reader(conn)
     
     def _on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             self.connected = True
-            result, mid = client.subscribe(self.topic)
+            result, mid = client.subscribe(self.topic, qos=self.qos)
             logger.info(f"Connected to MQTT broker, subscribed to {self.topic}, result={result}, mid={mid}")
         else:
             self.connected = False
@@ -84,6 +170,33 @@ class BioSensorMQTTClient:
     def _on_message(self, client, userdata, msg):
         # logger.info(f"Received message: {msg.topic} {msg.payload.decode()}")
         self.latest_data = json.loads(msg.payload.decode())
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._notify_new_data)
+
+    def _notify_new_data(self):
+        event, self._data_event = self._data_event, asyncio.Event()
+        event.set()
+
+    def _has_valid_record(self, valid_status):
+        data = self.latest_data
+        if not data or 'records' not in data:
+            return False
+        return any(
+            r.get('status') == valid_status and (r.get('bpm') or 0) > 0 and (r.get('rpm') or 0) > 0
+            for r in data['records']
+        )
+
+    async def _wait_for_valid_data(self, timeout, valid_status):
+        """Sleep up to timeout, waking early once a valid reading arrives."""
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    await self._data_event.wait()
+                    if self._has_valid_record(valid_status):
+                        return
+        except TimeoutError:
+            return
     
     def stop(self):
         self.client.loop_stop()
@@ -99,18 +212,11 @@ class BioSensorMQTTClient:
             raise
 
     def _save_scan_data(self, task_id, data, retry_count, is_valid=False):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        timestamp = get_now().isoformat()
-        cursor.execute('''
-            INSERT INTO sensor_scan_data
-            (task_id, location_id, bed_name, timestamp, retry_count, status, bpm, rpm, data_json, is_valid, details)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        row = (
             task_id,
             data.get('location_id'),
             data.get('bed_name'),
-            timestamp,
+            get_now().isoformat(),
             retry_count,
             data.get('status'),
             data.get('bpm'),
@@ -118,11 +224,84 @@ class BioSensorMQTTClient:
             json.dumps(data),
             is_valid,
             data.get('details'),
-        ))
-        conn.commit()
-        conn.close()
+        )
+        if self._writer_task is not None and not self._writer_task.done():
+            self._write_queue.put_nowait(row)
+        else:
+            self._write_rows([row])
+
+    def _write_rows(self, rows):
+        """Insert rows in one transaction. Blocking — call via asyncio.to_thread()."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                with conn:
+                    conn.executemany(_INSERT_SCAN_SQL, rows)
+            except sqlite3.IntegrityError:
+                # One bad row shouldn't drop the batch — retry individually
+                for row in rows:
+                    try:
+                        with conn:
+                            conn.execute(_INSERT_SCAN_SQL, row)
+                    except sqlite3.IntegrityError as e:
+                        logger.error(f"Dropped scan row for task {row[0]}: {e}")
+        finally:
+            conn.close()
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._write_queue.get()
+            if item is _WRITER_STOP:
+                return
+            rows = [item]
+            # One timer for the whole batch window; Queue.get() is safe to
+            # cancel, so a row is never lost when the window closes
+            try:
+                async with asyncio.timeout_at(loop.time() + _WRITE_BATCH_WINDOW):
+                    while len(rows) < _WRITE_BATCH_SIZE:
+                        item = await self._write_queue.get()
+                        if item is _WRITER_STOP:
+                            # Flush the batch in hand before exiting
+                            stopping = True
+                            break
+                        rows.append(item)
+            except TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(self._write_rows, rows)
+            except Exception as e:
+                logger.error(f"Failed to write {len(rows)} scan rows: {e}")
+
+    def start_writer(self):
+        """Start batching scan inserts on the running event loop."""
+        if self._writer_task is None or self._writer_task.done():
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop_writer(self):
+        """Stop the writer and flush any rows still queued."""
+        if self._writer_task is None:
+            return
+        # A sentinel instead of cancel(): the loop writes the batch it is
+        # holding before it exits
+        if not self._writer_task.done():
+            self._write_queue.put_nowait(_WRITER_STOP)
+        try:
+            await self._writer_task
+        except Exception as e:
+            logger.error(f"Scan writer stopped with an error: {e}")
+        self._writer_task = None
+        rows = []
+        while not self._write_queue.empty():
+            rows.append(self._write_queue.get_nowait())
+        if rows:
+            await asyncio.to_thread(self._write_rows, rows)
 
     async def get_valid_scan_data(self, task_id=None, target_bed=None, bed_name=None):
+        self._loop = asyncio.get_running_loop()
         if task_id is None:
             task_id = get_now().strftime("%Y%m%d%H%M%S")
 
@@ -148,7 +327,7 @@ class BioSensorMQTTClient:
             if self.latest_data and 'records' in self.latest_data:
                 has_any_data = True
                 for data in self.latest_data['records']:
-                    print("scan_data: ", data, "\n")
+                    logger.debug("scan_data: %s", data)
                     is_valid = data['status'] == VALID_STATUS and data['bpm'] > 0 and data['rpm'] > 0
                     data['details'] = '量測正常' if is_valid else '無有效量測數值'
                     data['location_id'] = target_bed
@@ -163,7 +342,7 @@ class BioSensorMQTTClient:
 
             # the last retry should not wait for extra interval
             if(retry_count + 1 < RETRY_COUNT):
-                await asyncio.sleep(WAIT_TIME)
+                await self._wait_for_valid_data(WAIT_TIME, VALID_STATUS)
 
         # Record a failed scan entry when no MQTT data was ever received
         if not has_any_data:
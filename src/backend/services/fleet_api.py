@@ -1,7 +1,8 @@
 """FleetAPI — async bridge over kachaka_core for FastAPI.
 
 Every public method is ``async`` and delegates to sync kachaka_core objects
-via ``asyncio.to_thread()``, keeping the event loop unblocked.
+in a worker thread, keeping the event loop unblocked: commands go through
+``asyncio.to_thread()``, short reads through a dedicated read pool.
 
 Replaces the old FleetAPI that used ``kachaka_api.aio.KachakaApiClient``
 directly.  All robot operations now flow through kachaka_core's
@@ -14,6 +15,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
@@ -27,6 +29,10 @@ from kachaka_core import (
 logger = logging.getLogger(__name__)
 
 
+class RobotNotFoundError(ValueError):
+    """Raised when a robot_id has not been registered with the FleetAPI."""
+
+
 # ---------------------------------------------------------------------------
 # Per-robot slot
 # ---------------------------------------------------------------------------
@@ -45,26 +51,67 @@ class _RobotSlot:
     status: str = "online"
     last_seen: float = field(default_factory=time.time)
     serial: str = ""
+    # Serializes commands that move the robot or its shelf
+    cmd_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 # ---------------------------------------------------------------------------
 # FleetAPI
 # ---------------------------------------------------------------------------
 
+def _query(method: str, doc: str):
+    """Build a FleetAPI coroutine method that runs ``queries.<method>()`` in a thread."""
+
+    async def query(self, robot_id: str) -> dict:
+        slot = self._get_slot(robot_id)
+        return await self._run_read(getattr(slot.queries, method))
+
+    query.__doc__ = doc
+    return query
+
+
 class FleetAPI:
     """Async bridge: FastAPI handlers -> sync kachaka_core objects."""
 
+    # Reads get their own workers so polling never queues behind movement
+    # commands, which hold a default-pool thread for up to two minutes
+    READ_POOL_SIZE = 8
+
     def __init__(self) -> None:
         self._robots: Dict[str, _RobotSlot] = {}
+        self._read_pool = ThreadPoolExecutor(
+            max_workers=self.READ_POOL_SIZE, thread_name_prefix="kachaka-read"
+        )
 
     # ── helpers ───────────────────────────────────────────────────────
 
+    async def _run_read(self, fn, *args: Any):
+        """Run a short blocking SDK read on the dedicated read pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._read_pool, fn, *args)
+
     def _get_slot(self, robot_id: str) -> _RobotSlot:
         slot = self._robots.get(robot_id)
         if slot is None:
-            raise ValueError(f"Robot {robot_id} not registered")
+            raise RobotNotFoundError(f"Robot {robot_id} not registered")
         return slot
 
+    async def _run_exclusive(
+        self, slot: _RobotSlot, preempt: bool, fn, /, *args: Any, **kwargs: Any
+    ):
+        """Run a movement command under the robot's command lock.
+
+        A ``preempt`` (cancel_all) command cancels whatever the lock holder is
+        running on the robot first, so it does not queue behind a multi-minute
+        move.
+        """
+        if preempt and slot.cmd_lock.locked():
+            try:
+                await asyncio.to_thread(slot.cmds.cancel_command)
+            except Exception as e:
+                logger.warning("Preempting cancel on %s failed: %s", slot.robot_id, e)
+        async with slot.cmd_lock:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
     # ── registration ─────────────────────────────────────────────────
 
     async def register_robot(
@@ -118,13 +165,19 @@ class FleetAPI:
         logger.info("Unregistered robot %s", robot_id)
         return True
 
+    async def shutdown(self) -> None:
+        """Stop every controller and close every pooled connection."""
+        for robot_id in list(self._robots):
+            try:
+                await self.unregister_robot(robot_id)
+            except Exception:
+                logger.exception("Failed to unregister robot %s", robot_id)
+        self._read_pool.shutdown(wait=False, cancel_futures=True)
+
     # ── status / metadata ────────────────────────────────────────────
 
-    async def get_robot_status(self, robot_id: str) -> Optional[Dict]:
-        """Return metadata dict for one robot, or None if not found."""
-        slot = self._robots.get(robot_id)
-        if slot is None:
-            return None
+    @staticmethod
+    def _slot_info(slot: _RobotSlot) -> Dict:
         return {
             "id": slot.robot_id,
             "ip": slot.ip,
@@ -134,19 +187,21 @@ class FleetAPI:
             "serial": slot.serial,
         }
 
+    async def get_robot_status(self, robot_id: str) -> Optional[Dict]:
+        """Return metadata dict for one robot, or None if not found."""
+        slot = self._robots.get(robot_id)
+        if slot is None:
+            return None
+        return self._slot_info(slot)
+
     async def get_all_robots(self) -> Dict[str, Dict]:
-        """Return metadata dicts for every registered robot."""
-        return {
-            rid: {
-                "id": s.robot_id,
-                "ip": s.ip,
-                "name": s.name,
-                "status": s.status,
-                "last_seen": s.last_seen,
-                "serial": s.serial,
-            }
-            for rid, s in self._robots.items()
-        }
+        """Return metadata dicts for every registered robot.
+
+        Built from in-memory slots only — no robot round-trip per entry. If a
+        live field is ever added here, fetch it with asyncio.gather rather than
+        awaiting robot by robot.
+        """
+        return {rid: self._slot_info(s) for rid, s in self._robots.items()}
 
     async def update_robot_status(self, robot_id: str, status: str) -> bool:
         """Update the logical status string for a robot."""
@@ -174,23 +229,27 @@ class FleetAPI:
                 "last_updated": st.last_updated,
             }
 
-        return await asyncio.to_thread(_read)
+        return await self._run_read(_read)
 
     async def get_metrics(self, robot_id: str) -> dict:
         """Return ControllerMetrics as a dict."""
         slot = self._get_slot(robot_id)
-        m = slot.ctrl.metrics
-        return {
-            "poll_count": m.poll_count,
-            "poll_success_count": m.poll_success_count,
-            "poll_failure_count": m.poll_failure_count,
-            "poll_rtt_list": list(m.poll_rtt_list),
-        }
+
+        def _read() -> dict:
+            m = slot.ctrl.metrics
+            return {
+                "poll_count": m.poll_count,
+                "poll_success_count": m.poll_success_count,
+                "poll_failure_count": m.poll_failure_count,
+                "poll_rtt_list": list(m.poll_rtt_list),
+            }
+
+        return await self._run_read(_read)
 
     async def reset_metrics(self, robot_id: str) -> None:
         """Clear metrics on the controller."""
         slot = self._get_slot(robot_id)
-        slot.ctrl.reset_metrics()
+        await asyncio.to_thread(slot.ctrl.reset_metrics)
 
     # ── movement commands (RobotController — command_id verified) ────
 
@@ -206,7 +265,9 @@ class FleetAPI:
     ) -> dict:
         """Move robot to a named location (blocking, with command_id tracking)."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(
+        return await self._run_exclusive(
+            slot,
+            cancel_all,
             slot.ctrl.move_to_location,
             location_name,
             timeout=timeout,
@@ -228,7 +289,9 @@ class FleetAPI:
     ) -> dict:
         """Pick up shelf and deliver to location (command_id verified)."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(
+        return await self._run_exclusive(
+            slot,
+            cancel_all,
             slot.ctrl.move_shelf,
             shelf_name,
             location_name,
@@ -250,7 +313,9 @@ class FleetAPI:
     ) -> dict:
         """Return shelf to its home location (command_id verified)."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(
+        return await self._run_exclusive(
+            slot,
+            cancel_all,
             slot.ctrl.return_shelf,
             shelf_name,
             timeout=timeout,
@@ -270,7 +335,9 @@ class FleetAPI:
     ) -> dict:
         """Return robot to charger (command_id verified)."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(
+        return await self._run_exclusive(
+            slot,
+            cancel_all,
             slot.ctrl.return_home,
             timeout=timeout,
             cancel_all=cancel_all,
@@ -288,20 +355,24 @@ class FleetAPI:
     async def dock_shelf(self, robot_id: str, **kwargs: Any) -> dict:
         """Dock the currently held shelf."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.cmds.dock_shelf, **kwargs)
+        return await self._run_exclusive(
+            slot, kwargs.get("cancel_all", True), slot.cmds.dock_shelf, **kwargs
+        )
 
     async def undock_shelf(self, robot_id: str, **kwargs: Any) -> dict:
         """Undock the currently held shelf."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.cmds.undock_shelf, **kwargs)
+        return await self._run_exclusive(
+            slot, kwargs.get("cancel_all", True), slot.cmds.undock_shelf, **kwargs
+        )
 
     async def move_to_pose(
         self, robot_id: str, x: float, y: float, yaw: float, **kwargs: Any
     ) -> dict:
         """Move to absolute map coordinate (x, y, yaw)."""
         slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(
-            slot.cmds.move_to_pose, x, y, yaw, **kwargs
+        return await self._run_exclusive(
+            slot, kwargs.get("cancel_all", True), slot.cmds.move_to_pose, x, y, yaw, **kwargs
         )
 
     async def cancel_command(self, robot_id: str) -> dict:
@@ -311,70 +382,19 @@ class FleetAPI:
 
     # ── queries (KachakaQueries — @with_retry) ───────────────────────
 
-    async def get_pose(self, robot_id: str) -> dict:
-        """Current robot pose on the map."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_pose)
-
-    async def get_battery_info(self, robot_id: str) -> dict:
-        """Battery percentage and charging status."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_battery)
-
-    async def get_locations(self, robot_id: str) -> dict:
-        """All registered locations."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.list_locations)
-
-    async def get_shelves(self, robot_id: str) -> dict:
-        """All registered shelves."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.list_shelves)
-
-    async def get_moving_shelf(self, robot_id: str) -> dict:
-        """ID of the shelf the robot is currently carrying."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_moving_shelf)
-
-    async def get_command_state(self, robot_id: str) -> dict:
-        """Current command execution state."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_command_state)
-
-    async def get_last_command_result(self, robot_id: str) -> dict:
-        """Result of the most recently completed command."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_last_command_result)
-
-    async def get_errors(self, robot_id: str) -> dict:
-        """Current active errors on the robot."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_errors)
-
-    async def get_status(self, robot_id: str) -> dict:
-        """Full snapshot: pose, battery, command state, errors."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_status)
-
-    async def get_serial_number(self, robot_id: str) -> dict:
-        """Robot serial number."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_serial_number)
-
-    async def get_map(self, robot_id: str) -> dict:
-        """Current map as base64-encoded PNG."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_map)
-
-    async def get_map_list(self, robot_id: str) -> dict:
-        """All available maps."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.list_maps)
-
-    async def get_speaker_volume(self, robot_id: str) -> dict:
-        """Current speaker volume (0-10)."""
-        slot = self._get_slot(robot_id)
-        return await asyncio.to_thread(slot.queries.get_speaker_volume)
+    get_pose = _query("get_pose", "Current robot pose on the map.")
+    get_battery_info = _query("get_battery", "Battery percentage and charging status.")
+    get_locations = _query("list_locations", "All registered locations.")
+    get_shelves = _query("list_shelves", "All registered shelves.")
+    get_moving_shelf = _query("get_moving_shelf", "ID of the shelf the robot is currently carrying.")
+    get_command_state = _query("get_command_state", "Current command execution state.")
+    get_last_command_result = _query("get_last_command_result", "Result of the most recently completed command.")
+    get_errors = _query("get_errors", "Current active errors on the robot.")
+    get_status = _query("get_status", "Full snapshot: pose, battery, command state, errors.")
+    get_serial_number = _query("get_serial_number", "Robot serial number.")
+    get_map = _query("get_map", "Current map as base64-encoded PNG.")
+    get_map_list = _query("list_maps", "All available maps.")
+    get_speaker_volume = _query("get_speaker_volume", "Current speaker volume (0-10).")
 
     # ── raw SDK access ───────────────────────────────────────────────
 
@@ -386,3 +406,9 @@ class FleetAPI:
         """
         slot = self._get_slot(robot_id)
         return slot.conn.client
+
+    async def read_raw(self, robot_id: str, method: str, *args: Any):
+        """Call a read-only raw client method (ROS topics, version, ...)
+        on the read pool and return its reply."""
+        client = self.get_raw_client(robot_id)
+        return await self._run_read(getattr(client, method), *args)
@@ -1,5 +1,7 @@
 import asyncio
 import logging
+from collections import defaultdict
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from services.fleet_api import FleetAPI
@@ -8,12 +10,61 @@ from dependencies import get_bio_sensor_client
 
 logger = logging.getLogger("kachaka.task_runtime")
 
+_pose_params = itemgetter("x", "y", "yaw")
+
 # --- global states ---
 tasks_db: Dict[str, Task] = {}
+tasks_by_status: Dict[TaskStatus, Dict[str, Task]] = defaultdict(dict)
 engines: Dict[str, "TaskEngine"] = {}
 task_queues: Dict[str, asyncio.Queue] = {}
 current_tasks: Dict[str, str] = {}  # robot_id -> task_id
 
+# Per-robot backlog bound; a robot runs one task at a time, so a deeper
+# queue only means something upstream is submitting in a loop
+TASK_QUEUE_MAXSIZE = 32
+
+
+def store_task(task: Task):
+    """Insert or replace a task in tasks_db, keeping the status index in sync."""
+    # Status may already have been changed on the object: clear every bucket
+    for bucket in tasks_by_status.values():
+        bucket.pop(task.task_id, None)
+    tasks_db[task.task_id] = task
+    tasks_by_status[task.status][task.task_id] = task
+
+
+def set_task_status(task: Task, status: TaskStatus):
+    """Change a task's status and move it to the matching index bucket."""
+    tasks_by_status[task.status].pop(task.task_id, None)
+    task.status = status
+    if tasks_db.get(task.task_id) is task:
+        tasks_by_status[status][task.task_id] = task
+
+
+def remove_task(task_id: str) -> Optional[Task]:
+    """Drop a task from tasks_db and the status index."""
+    task = tasks_db.pop(task_id, None)
+    if task is not None:
+        tasks_by_status[task.status].pop(task_id, None)
+    return task
+
+
+def _step_result(success: bool, error_code: int = 0, error_message: str = "",
+                 data: Optional[Dict[str, Any]] = None) -> StepResult:
+    """Build a StepResult stamped with the current time.
+
+    Values come from our own code and robot result dicts, so pydantic
+    validation is skipped; the two fields robot dicts may leave as None
+    are normalized here instead.
+    """
+    return StepResult.model_construct(
+        success=bool(success),
+        error_code=error_code or 0,
+        error_message=error_message or "",
+        data=data,
+        timestamp=get_now().isoformat(),
+    )
+
 
 async def submit_task(task: Task):
     """Submit a task for execution. Routes directly to the robot's queue."""
@@ -22,11 +73,17 @@ async def submit_task(task: Task):
     if robot_id not in task_queues:
         logger.error(f"Robot '{robot_id}' not registered. Failing task {task.task_id}.")
         task.status = TaskStatus.FAILED
-        tasks_db[task.task_id] = task
+        store_task(task)
+        return
+    try:
+        task_queues[robot_id].put_nowait(task)
+    except asyncio.QueueFull:
+        logger.error(f"Robot '{robot_id}' queue is full ({TASK_QUEUE_MAXSIZE} tasks). Failing task {task.task_id}.")
+        task.status = TaskStatus.FAILED
+        store_task(task)
         return
     task.status = TaskStatus.QUEUED
-    tasks_db[task.task_id] = task
-    await task_queues[robot_id].put(task)
+    store_task(task)
     logger.info(f"Task {task.task_id} submitted to robot {robot_id}")
 
 
@@ -39,6 +96,25 @@ class TaskEngine:
         self._shelf_dropped = False
         self._shelf_monitor_stop = False
         self._shelf_monitor_task: Optional[asyncio.Task] = None
+        self._bio_client = None
+        self._handlers = {
+            "speak": self._do_speak,
+            "move_to_pose": self._do_move_to_pose,
+            "move_to_location": self._do_move_to_location,
+            "dock_shelf": self._do_dock_shelf,
+            "undock_shelf": self._do_undock_shelf,
+            "move_shelf": self._do_move_shelf,
+            "return_shelf": self._do_return_shelf,
+            "return_home": self._do_return_home,
+            "bio_scan": self._do_bio_scan,
+            "wait": self._do_wait,
+        }
+
+    def _get_bio_client(self):
+        """Bio-sensor client, looked up once it exists (None while MQTT is disabled)."""
+        if self._bio_client is None:
+            self._bio_client = get_bio_sensor_client()
+        return self._bio_client
 
     async def _refresh_name_cache(self):
         """Fetch shelf/location names from robot for readable logs"""
@@ -163,7 +239,7 @@ class TaskEngine:
                              location_id: str = "", extra_data: dict = None):
         """Record a skipped bio_scan step in the database."""
         try:
-            client = get_bio_sensor_client()
+            client = self._get_bio_client()
             if not client:
                 logger.warning(f"Cannot record skipped scan {step.step_id} - MQTT client not available")
                 return
@@ -223,12 +299,12 @@ class TaskEngine:
             "remaining_beds": remaining_beds,
             "shelf_pose": shelf_pose,
         }
-        task.status = TaskStatus.SHELF_DROPPED
+        set_task_status(task, TaskStatus.SHELF_DROPPED)
 
         # Telegram notification
         try:
-            from services.telegram_service import send_telegram_message
-            await send_telegram_message("⚠️ 貨架掉落，請協助歸位")
+            from services.telegram_service import notify_telegram
+            notify_telegram("⚠️ 貨架掉落，請協助歸位")
         except Exception as tg_err:
             logger.error(f"Failed to send shelf-drop Telegram: {tg_err}")
 
@@ -259,20 +335,21 @@ class TaskEngine:
     async def run_task(self, task: Task) -> Task:
         logger.info(f"===> Starting task: {task.task_id} on robot {task.robot_id}")
         await self._refresh_name_cache()
-        task.status = TaskStatus.IN_PROGRESS
+        set_task_status(task, TaskStatus.IN_PROGRESS)
         current_tasks[task.robot_id] = task.task_id
         self.current_task_id = task.task_id
-        self.task_start_time = get_now().strftime("%Y%m%d%H%M%S")
         self._shelf_dropped = False
         self._shelf_monitor_stop = False
         self._shelf_monitor_task = None
 
         try:
             step_index = 0
-            skipped_steps = set()
-            skip_reasons = {}
+            skip_reasons = {}  # step_id -> failure that causes it to be skipped
 
             while step_index < len(task.steps):
+                # A run of skipped steps never awaits; yield now and then
+                if step_index and (step_index & 31) == 0:
+                    await asyncio.sleep(0)
                 step = task.steps[step_index]
 
                 if task.status == TaskStatus.CANCELLED:
@@ -285,10 +362,10 @@ class TaskEngine:
                     break
 
                 # Check if this step should be skipped
-                if step.step_id in skipped_steps:
+                skip_reason = skip_reasons.get(step.step_id)
+                if skip_reason is not None:
                     logger.info(f"[SKIP] Robot {self.robot_id}, Step {step.step_id} skipped due to conditional logic")
                     step.status = StepStatus.SKIPPED
-                    skip_reason = skip_reasons.get(step.step_id, {})
 
                     if step.action == "bio_scan":
                         self._record_skipped_scan(step, "機器人無法移動到床邊", extra_data={
@@ -297,7 +374,7 @@ class TaskEngine:
                             "original_error_message": skip_reason.get("error_message"),
                         })
 
-                    step.result = StepResult(
+                    step.result = _step_result(
                         success=False,
                         error_code=skip_reason.get("error_code", 0),
                         error_message=skip_reason.get("error_message", "Step skipped due to previous step failure"),
@@ -305,8 +382,7 @@ class TaskEngine:
                             "reason": "conditional_skip",
                             "caused_by_step": skip_reason.get("failed_step_id"),
                             "original_error": skip_reason.get("original_error")
-                        },
-                        timestamp=get_now().isoformat()
+                        }
                     )
                     step_index += 1
                     continue
@@ -316,8 +392,7 @@ class TaskEngine:
                 step.status = StepStatus.EXECUTING
 
                 try:
-                    skip_reason = skip_reasons.get(step.step_id) if step.step_id in skip_reasons else None
-                    step_result = await self._execute_step(step, skip_reason)
+                    step_result = await self._execute_step(step)
                     step.result = step_result
                     step.status = StepStatus.SUCCESS if step_result.success else StepStatus.FAIL
 
@@ -332,7 +407,6 @@ class TaskEngine:
                         logger.warning(f"[!] Robot {self.robot_id}, Step {step.step_id} failed: {step_result.error_message} (code: {step_result.error_code})")
 
                         if step.skip_on_failure:
-                            skipped_steps.update(step.skip_on_failure)
                             logger.info(f"[CONDITIONAL] Step {step.step_id} failed, will skip steps: {step.skip_on_failure}")
                             for skip_step_id in step.skip_on_failure:
                                 skip_reasons[skip_step_id] = {
@@ -345,21 +419,19 @@ class TaskEngine:
                             logger.warning(f"[NON-CRITICAL] Step {step.step_id} ({step.action}) failed, continuing to next step")
                         else:
                             if task.status != TaskStatus.CANCELLED:
-                                task.status = TaskStatus.FAILED
+                                set_task_status(task, TaskStatus.FAILED)
                             break
 
                 except Exception as e:
                     logger.error(f"[X] Robot {self.robot_id}, Exception in step {step.step_id}: {str(e)}", exc_info=True)
-                    step.result = StepResult(
+                    step.result = _step_result(
                         success=False, error_code=-1,
                         error_message=f"TaskEngine exception: {str(e)}",
-                        data={"step_id": step.step_id, "action": step.action},
-                        timestamp=get_now().isoformat()
+                        data={"step_id": step.step_id, "action": step.action}
                     )
                     step.status = StepStatus.FAIL
 
                     if step.skip_on_failure:
-                        skipped_steps.update(step.skip_on_failure)
                         logger.info(f"[CONDITIONAL] Step {step.step_id} exception, will skip steps: {step.skip_on_failure}")
                         for skip_step_id in step.skip_on_failure:
                             skip_reasons[skip_step_id] = {
@@ -372,13 +444,13 @@ class TaskEngine:
                         logger.warning(f"[NON-CRITICAL] Step {step.step_id} ({step.action}) exception, continuing to next step")
                     else:
                         if task.status != TaskStatus.CANCELLED:
-                            task.status = TaskStatus.FAILED
+                            set_task_status(task, TaskStatus.FAILED)
                         break
 
                 step_index += 1
 
             if task.status == TaskStatus.IN_PROGRESS:
-                task.status = TaskStatus.DONE
+                set_task_status(task, TaskStatus.DONE)
                 logger.info(f"===> Task {task.task_id} completed successfully on robot {self.robot_id}")
 
             # Collect metrics from kachaka_core controller
@@ -411,14 +483,14 @@ class TaskEngine:
                     logger.error(f"[{tag}] Cancelled cleanup error: {e}")
 
             try:
-                from services.telegram_service import send_telegram_message
+                from services.telegram_service import notify_telegram
                 bio_steps = [s for s in task.steps if s.action == "bio_scan"]
                 total_beds = len(bio_steps)
                 success_beds = sum(1 for s in bio_steps if s.status == StepStatus.SUCCESS)
                 if task.status == TaskStatus.CANCELLED:
-                    await send_telegram_message(f"🚫 巡房已取消\n本次巡房 {total_beds} 床，已完成 {success_beds} 床")
+                    notify_telegram(f"🚫 巡房已取消\n本次巡房 {total_beds} 床，已完成 {success_beds} 床")
                 else:
-                    await send_telegram_message(f"✅ 巡房完成\n本次巡房 {total_beds} 床，成功讀取 {success_beds} 床")
+                    notify_telegram(f"✅ 巡房完成\n本次巡房 {total_beds} 床，成功讀取 {success_beds} 床")
             except Exception as tg_err:
                 logger.error(f"Failed to send task-completion Telegram: {tg_err}")
             current_tasks.pop(self.robot_id, None)
@@ -429,122 +501,121 @@ class TaskEngine:
 
     def _make_result(self, api_result: dict, action: str, data: dict) -> StepResult:
         """Create StepResult from a robot API result dict."""
-        return StepResult(
+        return _step_result(
             success=api_result.get("ok", False),
             error_code=api_result.get("error_code", 0),
             error_message=api_result.get("error", "") if not api_result.get("ok") else "",
-            data=data,
-            timestamp=get_now().isoformat(),
+            data=data
         )
 
-    async def _execute_step(self, step: TaskStep, skip_reason=None) -> StepResult:
+    async def _execute_step(self, step: TaskStep) -> StepResult:
         action = step.action
         params = step.params
+        handler = self._handlers.get(action)
+        if handler is None:
+            logger.error(f"Unknown action: {action} for robot {self.robot_id}")
+            return _step_result(
+                success=False, error_code=-1,
+                error_message=f"Unknown action: {action}",
+                data={"action": action}
+            )
         try:
-            if action == "speak":
-                result = await self.fleet.speak(self.robot_id, params["speak_text"])
-                return self._make_result(result, action, {"speak_text": params["speak_text"]})
+            return await handler(params)
 
-            elif action == "move_to_pose":
-                result = await self.fleet.move_to_pose(self.robot_id, float(params["x"]), float(params["y"]), float(params["yaw"]))
-                return self._make_result(result, action, {"x": float(params["x"]), "y": float(params["y"]), "yaw": float(params["yaw"])})
-
-            elif action == "move_to_location":
-                result = await self.fleet.move_to_location(self.robot_id, params["location_id"])
-                return self._make_result(result, action, {"location_id": params["location_id"]})
+        except ValueError as e:
+            logger.error(f"[!] Robot {self.robot_id} not found: {str(e)}")
+            return _step_result(
+                success=False, error_code=-1,
+                error_message=f"Robot {self.robot_id} not found: {str(e)}",
+                data={"action": action, "params": params}
+            )
+        except Exception as e:
+            logger.error(f"[X] Unexpected error during action {action} for robot {self.robot_id}: {str(e)}", exc_info=True)
+            return _step_result(
+                success=False, error_code=-1,
+                error_message=f"Unexpected error: {str(e)}",
+                data={"action": action, "params": params}
+            )
 
-            elif action == "dock_shelf":
-                result = await self.fleet.dock_shelf(self.robot_id)
-                return self._make_result(result, action, {})
+    async def _do_speak(self, params: Dict[str, Any]) -> StepResult:
+        result = await self.fleet.speak(self.robot_id, params["speak_text"])
+        return self._make_result(result, "speak", {"speak_text": params["speak_text"]})
 
-            elif action == "undock_shelf":
-                result = await self.fleet.undock_shelf(self.robot_id)
-                return self._make_result(result, action, {})
+    async def _do_move_to_pose(self, params: Dict[str, Any]) -> StepResult:
+        x, y, yaw = map(float, _pose_params(params))
+        result = await self.fleet.move_to_pose(self.robot_id, x, y, yaw)
+        return self._make_result(result, "move_to_pose", {"x": x, "y": y, "yaw": yaw})
 
-            elif action == "move_shelf":
-                self.target_bed = params["location_id"]
+    async def _do_move_to_location(self, params: Dict[str, Any]) -> StepResult:
+        result = await self.fleet.move_to_location(self.robot_id, params["location_id"])
+        return self._make_result(result, "move_to_location", {"location_id": params["location_id"]})
 
-                result = await self.fleet.move_shelf(self.robot_id, params["shelf_id"], params["location_id"])
+    async def _do_dock_shelf(self, params: Dict[str, Any]) -> StepResult:
+        result = await self.fleet.dock_shelf(self.robot_id)
+        return self._make_result(result, "dock_shelf", {})
 
-                # Start shelf monitor after first successful move_shelf
-                if result.get("ok") and self._shelf_monitor_task is None:
-                    self._current_shelf_id = params["shelf_id"]
-                    self._shelf_monitor_stop = False
-                    self._shelf_dropped = False
-                    self._shelf_monitor_task = asyncio.create_task(self._monitor_shelf())
+    async def _do_undock_shelf(self, params: Dict[str, Any]) -> StepResult:
+        result = await self.fleet.undock_shelf(self.robot_id)
+        return self._make_result(result, "undock_shelf", {})
 
-                return self._make_result(result, action, {"shelf_id": params["shelf_id"], "location_id": params["location_id"]})
+    async def _do_move_shelf(self, params: Dict[str, Any]) -> StepResult:
+        self.target_bed = params["location_id"]
 
-            elif action == "return_shelf":
-                # Stop shelf monitor before return_shelf — no longer needed
-                await self._stop_shelf_monitor()
+        result = await self.fleet.move_shelf(self.robot_id, params["shelf_id"], params["location_id"])
 
-                result = await self.fleet.return_shelf(self.robot_id, params["shelf_id"])
-                return self._make_result(result, action, {"shelf_id": params["shelf_id"]})
+        # Start shelf monitor after first successful move_shelf
+        if result.get("ok") and self._shelf_monitor_task is None:
+            self._current_shelf_id = params["shelf_id"]
+            self._shelf_monitor_stop = False
+            self._shelf_dropped = False
+            self._shelf_monitor_task = asyncio.create_task(self._monitor_shelf())
 
-            elif action == "return_home":
-                result = await self.fleet.return_home(self.robot_id)
-                return self._make_result(result, action, {})
+        return self._make_result(result, "move_shelf", {"shelf_id": params["shelf_id"], "location_id": params["location_id"]})
 
-            elif action == "bio_scan":
-                client = get_bio_sensor_client()
-                if client is None:
-                    return StepResult(
-                        success=False, error_code=-1,
-                        error_message="Bio-sensor MQTT client is not available (mqtt_enabled=false)",
-                        data={}, timestamp=get_now().isoformat()
-                    )
-                bed_key = params.get("bed_key")
-                scan_result = await client.get_valid_scan_data(target_bed=self.target_bed, task_id=self.current_task_id, bed_name=bed_key)
-                logger.info(f"Bio scan result for robot {self.robot_id}: {scan_result}")
+    async def _do_return_shelf(self, params: Dict[str, Any]) -> StepResult:
+        # Stop shelf monitor before return_shelf — no longer needed
+        await self._stop_shelf_monitor()
 
-                success = scan_result is not None and scan_result.get("data") is not None
-                if success:
-                    logger.info(f"Bio scan completed successfully for robot {self.robot_id}")
-                else:
-                    logger.warning(f"Bio scan failed - no valid data obtained for robot {self.robot_id}")
-
-                return StepResult(
-                    success=success,
-                    error_code=0 if success else -1,
-                    error_message="Bio scan completed successfully" if success else "No valid data obtained after all retries",
-                    data=scan_result or {},
-                    timestamp=get_now().isoformat()
-                )
-
-            elif action == "wait":
-                seconds = float(params.get("seconds", "1.0"))
-                await asyncio.sleep(seconds)
-                return StepResult(
-                    success=True, error_code=0,
-                    error_message="Wait completed successfully",
-                    data={"seconds": seconds}, timestamp=get_now().isoformat()
-                )
+        result = await self.fleet.return_shelf(self.robot_id, params["shelf_id"])
+        return self._make_result(result, "return_shelf", {"shelf_id": params["shelf_id"]})
 
-            else:
-                logger.error(f"Unknown action: {action} for robot {self.robot_id}")
-                return StepResult(
-                    success=False, error_code=-1,
-                    error_message=f"Unknown action: {action}",
-                    data={"action": action}, timestamp=get_now().isoformat()
-                )
+    async def _do_return_home(self, params: Dict[str, Any]) -> StepResult:
+        result = await self.fleet.return_home(self.robot_id)
+        return self._make_result(result, "return_home", {})
 
-        except ValueError as e:
-            logger.error(f"[!] Robot {self.robot_id} not found: {str(e)}")
-            return StepResult(
+    async def _do_bio_scan(self, params: Dict[str, Any]) -> StepResult:
+        client = self._get_bio_client()
+        if client is None:
+            return _step_result(
                 success=False, error_code=-1,
-                error_message=f"Robot {self.robot_id} not found: {str(e)}",
-                data={"action": action, "params": params},
-                timestamp=get_now().isoformat()
-            )
-        except Exception as e:
-            logger.error(f"[X] Unexpected error during action {action} for robot {self.robot_id}: {str(e)}", exc_info=True)
-            return StepResult(
-                success=False, error_code=-1,
-                error_message=f"Unexpected error: {str(e)}",
-                data={"action": action, "params": params},
-                timestamp=get_now().isoformat()
+                error_message="Bio-sensor MQTT client is not available (mqtt_enabled=false)",
+                data={}
             )
+        bed_key = params.get("bed_key")
+        scan_result = await client.get_valid_scan_data(target_bed=self.target_bed, task_id=self.current_task_id, bed_name=bed_key)
+        logger.info(f"Bio scan result for robot {self.robot_id}: {scan_result}")
+
+        success = scan_result is not None and scan_result.get("data") is not None
+        if success:
+            logger.info(f"Bio scan completed successfully for robot {self.robot_id}")
+        else:
+            logger.warning(f"Bio scan failed - no valid data obtained for robot {self.robot_id}")
+
+        return _step_result(
+            success=success,
+            error_code=0 if success else -1,
+            error_message="Bio scan completed successfully" if success else "No valid data obtained after all retries",
+            data=scan_result or {}
+        )
+
+    async def _do_wait(self, params: Dict[str, Any]) -> StepResult:
+        seconds = float(params.get("seconds", "1.0"))
+        await asyncio.sleep(seconds)
+        return _step_result(
+            success=True, error_code=0,
+            error_message="Wait completed successfully",
+            data={"seconds": seconds}
+        )
 
 
 async def task_worker(robot_id: str):
@@ -556,7 +627,7 @@ async def task_worker(robot_id: str):
         logger.info(f"Robot {robot_id} worker: got task {task.task_id} from its queue.")
         if task.status != TaskStatus.CANCELLED:
             updated_task = await engine.run_task(task)
-            tasks_db[task.task_id] = updated_task
+            store_task(updated_task)
         else:
             logger.info(f"Robot {robot_id} worker: task {task.task_id} was already cancelled. Not running.")
         queue.task_done()
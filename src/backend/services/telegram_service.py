@@ -2,11 +2,46 @@
 Telegram notification service.
 Sends messages via Telegram Bot API when enabled in settings.
 """
+import asyncio
 import logging
+from typing import Optional, Set
+
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Shared client: keeps the connection to api.telegram.org alive between messages
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=10.0)
+    return _client
+
+
+# Strong refs to fire-and-forget sends so they aren't garbage-collected mid-flight
+_pending: Set[asyncio.Task] = set()
+
+
+def notify_telegram(message: str) -> asyncio.Task:
+    """Send a Telegram message in the background without awaiting it."""
+    t = asyncio.create_task(send_telegram_message(message))
+    _pending.add(t)
+    t.add_done_callback(_pending.discard)
+    return t
+
+
+async def close_telegram_client():
+    """Let in-flight sends finish, then close the shared HTTP client (on shutdown)."""
+    global _client
+    if _pending:
+        await asyncio.wait(_pending, timeout=10.0)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def send_telegram_message(message: str):
     """Send a Telegram message if enabled in runtime settings."""
@@ -28,11 +63,10 @@ async def send_telegram_message(message: str):
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         payload = {"chat_id": user_id, "text": message, "parse_mode": "HTML"}
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code == 200:
-                logger.info("Telegram message sent successfully")
-            else:
-                logger.warning(f"Telegram API returned {resp.status_code}: {resp.text}")
+        resp = await _get_client().post(url, json=payload)
+        if resp.status_code == 200:
+            logger.info("Telegram message sent successfully")
+        else:
+            logger.warning(f"Telegram API returned {resp.status_code}: {resp.text}")
     except Exception as e:
         logger.error(f"Failed to send Telegram message: {e}")
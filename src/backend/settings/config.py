@@ -15,13 +15,57 @@ PATROL_FILE = os.path.join(get_settings_dir(), "patrol.json")
 SCHEDULE_FILE = os.path.join(get_settings_dir(), "schedule.json")
 
 
+# (mtime_ns, size) of settings.json when it was last parsed, and the result
+_settings_cache = None
+
+
 def get_runtime_settings() -> dict:
-    """Load runtime settings merged with defaults. Called per-request for fresh values."""
+    """Load runtime settings merged with defaults.
+
+    Called per-request (and by get_now()), so the parsed file is cached and
+    only re-read when settings.json changes on disk or after
+    invalidate_runtime_settings(). Returns a fresh copy each call.
+    """
+    global _settings_cache
+    try:
+        st = os.stat(SETTINGS_FILE)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    cached = _settings_cache
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+
     from settings.defaults import DEFAULT_SETTINGS
     from utils.json_io import load_json
     saved = load_json(SETTINGS_FILE, {})
     merged = {**DEFAULT_SETTINGS, **saved}
-    return merged
+    _settings_cache = (stamp, merged)
+    return dict(merged)
+
+
+def prime_runtime_settings(saved: dict) -> dict:
+    """Seed the cache with settings.json contents that were just written.
+
+    Saves the re-read after a write; returns a fresh merged copy.
+    """
+    global _settings_cache
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except OSError:
+        _settings_cache = None
+        return get_runtime_settings()
+    from settings.defaults import DEFAULT_SETTINGS
+    merged = {**DEFAULT_SETTINGS, **saved}
+    _settings_cache = ((st.st_mtime_ns, st.st_size), merged)
+    return dict(merged)
+
+
+def invalidate_runtime_settings():
+    """Force the next get_runtime_settings() call to re-read settings.json."""
+    global _settings_cache
+    _settings_cache = None
 
 
 def get_port() -> int:
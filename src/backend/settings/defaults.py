@@ -9,6 +9,7 @@ DEFAULT_SETTINGS = {
     "mqtt_topic": "/data-test/demo/wisleep-eck/org/201906078",
     "mqtt_shelf_id": "",
     "mqtt_enabled": False,
+    "mqtt_qos": 0,
     "bio_scan_wait_time": 10,
     "bio_scan_retry_count": 19,
     "bio_scan_initial_wait": 120,
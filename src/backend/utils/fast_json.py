@@ -0,0 +1,27 @@
+"""
+Fast JSON serialisation helpers.
+Uses orjson when it is installed and falls back to the stdlib json module otherwise.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise content to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (stdlib fallback when unavailable)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -7,6 +7,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# filepath -> ((mtime_ns, size), parsed data)
+_json_cache = {}
+
 
 def load_json(filepath: str, default=None):
     """Load JSON from file, returning default if file doesn't exist or is invalid."""
@@ -24,8 +27,30 @@ def load_json(filepath: str, default=None):
         return default
 
 
+def load_json_cached(filepath: str, default=None, stat_result=None):
+    """Like load_json(), but re-parses only when the file's mtime/size change.
+
+    The returned object is shared with later callers: treat it as read-only
+    (use load_json() when the data is going to be modified and saved).
+    Directory scans can pass ``DirEntry.stat()`` as ``stat_result``.
+    """
+    try:
+        st = stat_result if stat_result is not None else os.stat(filepath)
+    except OSError:
+        _json_cache.pop(filepath, None)
+        return load_json(filepath, default)
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _json_cache.get(filepath)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    data = load_json(filepath, default)
+    _json_cache[filepath] = (stamp, data)
+    return data
+
+
 def save_json(filepath: str, data):
     """Save data as JSON to file, creating directories as needed."""
+    _json_cache.pop(filepath, None)
     try:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, "w", encoding="utf-8") as f:
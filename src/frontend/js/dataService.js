@@ -164,6 +164,11 @@ class DataService {
     return res.data;
   }
 
+  async getRobotSummary() {
+    const res = await axios.get(`/kachaka/${this.robotId}/summary`);
+    return res.data;
+  }
+
   async getRobotMap() {
     const res = await axios.get(`/kachaka/${this.robotId}/map`);
     return res.data;
@@ -148,10 +148,10 @@ function startPolling() {
 
 async function fetchRobotStatus() {
   try {
-    const [batteryRes, poseRes] = await Promise.all([
-      dataService.getRobotBattery(),
-      dataService.getRobotPose(),
-    ]);
+    // One request for pose + battery (+ errors / command state)
+    const summary = await dataService.getRobotSummary();
+    const batteryRes = summary?.battery;
+    const poseRes = summary?.pose;
 
     // Battery
     const battery = batteryRes?.remaining_percentage;
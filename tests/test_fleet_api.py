@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+from services.fleet_api import FleetAPI, _RobotSlot
+
+
+class _FakeRobot:
+    """Stands in for both RobotController and KachakaCommands.
+
+    ``move_shelf`` blocks until ``cancel_command`` is called, like a real
+    multi-minute move that only ends early when the robot is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = threading.Event()
+        self.calls = []
+
+    def move_shelf(self, shelf_name, location_name, **kwargs):
+        self.calls.append("move_shelf")
+        self.cancelled.wait(timeout=5)
+        return {"ok": False, "error": "cancelled"}
+
+    def return_home(self, **kwargs):
+        self.calls.append("return_home")
+        return {"ok": True}
+
+    def cancel_command(self):
+        self.calls.append("cancel_command")
+        self.cancelled.set()
+        return {"ok": True}
+
+
+def _fleet_with_robot(robot: _FakeRobot) -> FleetAPI:
+    fleet = FleetAPI()
+    fleet._robots["r1"] = _RobotSlot(
+        robot_id="r1", ip="127.0.0.1", name="r1",
+        conn=None, ctrl=robot, cmds=robot, queries=None,
+    )
+    return fleet
+
+
+def test_cancel_all_command_preempts_held_lock():
+    robot = _FakeRobot()
+    fleet = _fleet_with_robot(robot)
+
+    async def scenario():
+        move = asyncio.create_task(fleet.move_shelf("r1", "S01", "L01"))
+        while not fleet._robots["r1"].cmd_lock.locked() and not move.done():
+            await asyncio.sleep(0.01)
+        home = await asyncio.wait_for(fleet.return_home("r1", cancel_all=True), timeout=2)
+        return await move, home
+
+    try:
+        move_result, home_result = asyncio.run(scenario())
+    finally:
+        fleet._read_pool.shutdown(wait=False)
+
+    assert home_result == {"ok": True}
+    assert move_result["ok"] is False
+    assert robot.calls == ["move_shelf", "cancel_command", "return_home"]
+
+
+def test_command_without_cancel_all_waits_for_lock():
+    robot = _FakeRobot()
+    fleet = _fleet_with_robot(robot)
+
+    async def scenario():
+        move = asyncio.create_task(fleet.move_shelf("r1", "S01", "L01"))
+        while not fleet._robots["r1"].cmd_lock.locked() and not move.done():
+            await asyncio.sleep(0.01)
+        home = asyncio.create_task(fleet.return_home("r1", cancel_all=False))
+        await asyncio.sleep(0.1)
+        assert not home.done()
+        robot.cancelled.set()
+        await move
+        return await home
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        fleet._read_pool.shutdown(wait=False)
+
+    assert robot.calls == ["move_shelf", "return_home"]